@@ -2,7 +2,7 @@
 NAME: CHEAH WENG HOE
 TP NUMBER: TP055533
 Date Created: 24/12/2024
-Date Modified: 30/12/2024
+Date Modified: 18/10/2026
 
 Module to Extract Text from the Corpus
 
@@ -12,33 +12,76 @@ https://archive.org/download/psychology_collection_202309
 
 import os
 import re
+import json
+import mmap
+import codecs
+import shutil
+import hashlib
 import logging
+import multiprocessing
+
+
+# Clean one book in a pool worker, returning (cache file, error message or None)
+def _build_book(corpus_dir, processed_dir, chunk_size, book):
+
+    corpus_builder = CorpusBuilder(chunk_size = chunk_size, manifest_file = None)
+    corpus_builder.corpus_dir = corpus_dir
+    corpus_builder.processed_dir = processed_dir
+
+    file_name, start_marker, end_marker, cache_file = book
+
+    return cache_file, corpus_builder.write_clean_contents_file(start_marker, end_marker, cache_file, file_name)
+
 
 class CorpusBuilder:
 
+    # Version of the processing (part of the key of every cleaned book)
+    CORPUS_CACHE_VERSION = 1
+
+    # Cleaning patterns of the main content (also part of the key of every cleaned book)
+    ED_PATTERN = r'\s*--\s*ED\s*\.\s*'
+    HYPHEN_PATTERN = r'-'
+    WHITESPACE_PATTERN = r'\s+'
+
+    # A chunk may only end in whitespace followed by a character that cannot start or continue "-- ED .",
+    # so neither the ED pattern nor a whitespace run is split between two chunks
+    CHUNK_BOUNDARY_PATTERN = re.compile(r'\s(?=[^\s\-E.])')
+
     # Initialisation to avoid potential undefined variable errors
-    def __init__(self):
+    def __init__(self, streaming = True, chunk_size = 65536, manifest_file = os.path.join("Corpora", "corpora.json"),
+                 workers = 1):
         self.text = ""
+        self.streaming = streaming      # Process each book on its own from a memory-mapped file
+        self.chunk_size = chunk_size    # Bytes cleaned at a time when streaming
+        self.workers = workers          # Processes cleaning the changed books (None: one per CPU)
         self.corpus_dir = os.path.join("Corpora", "raw")    # Directory for raw text
         self.processed_dir = os.path.join("Corpora", "processed")   # Directory for processed text
+        self.ingested_dir = os.path.join("Corpora", "ingested")     # Directory for cleaned text added with ingest
         os.makedirs(self.processed_dir, exist_ok = True)
         logging.basicConfig(level = logging.INFO)   # Logging for debugging
 
+        # Keys of the cleaned books, so only a changed book is processed again
+        self.processed_manifest_file = "manifest.json"
+
+        # Books with their markers and cache files, defined in the manifest
+        self.books = self.load_manifest(manifest_file) if manifest_file is not None else []
+        self.files = [book["file"] for book in self.books]
+        self.cache_files = [book["cache_file"] for book in self.books]
+
+
+    # Function to load the books from the corpus manifest
+    def load_manifest(self, manifest_file):
+        with open(manifest_file, 'r', encoding = 'UTF-8') as f:
+            return json.load(f)["books"]
+
 
     # Function to read the text from corpus
     def read_text(self):
 
         self.text = ""
 
-        # Defining all the books
-        files = [
-            "INTRODUCTION TO PSYCHOLOGY.txt",
-            "HOW TO ANALYZE PEOPLE WITH DARK PSYCHOLOGY.txt",
-            "MOH.txt"
-        ]
-
         # Reading all the defined books
-        for file_name in files:
+        for file_name in self.files:
             
             # Define the file path
             file_path = os.path.join(self.corpus_dir, file_name)
@@ -89,22 +132,238 @@ class CorpusBuilder:
     def text_cleaning(self, body_text):
         
         # Clean ED
-        cleaned_text = re.sub(r'\s*--\s*ED\s*\.\s*', '', body_text)
+        cleaned_text = re.sub(self.ED_PATTERN, '', body_text)
 
         # Replace '-' with space
-        cleaned_text = re.sub(r'-', ' ', cleaned_text)
+        cleaned_text = re.sub(self.HYPHEN_PATTERN, ' ', cleaned_text)
 
         # Remove extra spaces
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
+        cleaned_text = re.sub(self.WHITESPACE_PATTERN, ' ', cleaned_text).strip()
 
         return cleaned_text
 
 
+    # Function to find the (start, end) byte offsets of the main content of a memory-mapped book
+    def find_main_content(self, mapped_text, start_marker, end_marker):
+
+        # Second occurrence of the start marker
+        start_matches = re.finditer(start_marker.encode('UTF-8'), mapped_text, re.IGNORECASE)
+        start_match = next(start_matches, None) and next(start_matches, None)
+
+        if start_match is None:
+            logging.error("Second occurrence of the start marker not found.")
+            return "Second occurrence of the start marker not found."
+
+        end_pos = mapped_text.find(end_marker.encode('UTF-8'))
+
+        if end_pos == -1:
+            logging.error("End marker not found.")
+            return "End marker not found."
+
+        return start_match.start(), max(start_match.start(), end_pos)
+
+
+    # Function to clean a chunk of the main content (text_cleaning without stripping the ends)
+    def clean_chunk(self, text):
+
+        cleaned_text = re.sub(self.ED_PATTERN, '', text)
+        cleaned_text = re.sub(self.HYPHEN_PATTERN, ' ', cleaned_text)
+
+        return re.sub(self.WHITESPACE_PATTERN, ' ', cleaned_text)
+
+
+    # Function to clean the main content of one book chunk by chunk, writing it to output as it goes
+    def stream_clean_contents(self, file_name, start_marker, end_marker, output):
+
+        file_path = os.path.join(self.corpus_dir, file_name)
+
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mapped_text:
+
+            content_range = self.find_main_content(mapped_text, start_marker, end_marker)
+            if isinstance(content_range, str):
+                return content_range
+
+            start_pos, end_pos = content_range
+            decoder = codecs.getincrementaldecoder('UTF-8')()
+            buffer = ""
+            pending_space = False   # Trailing space held back so the end of the text is stripped
+            started = False         # Leading spaces are stripped
+
+            for chunk_start in range(start_pos, end_pos + 1, self.chunk_size):
+
+                chunk_end = min(chunk_start + self.chunk_size, end_pos)
+                final = chunk_end >= end_pos
+                buffer += decoder.decode(mapped_text[chunk_start:chunk_end], final)
+
+                # Clean up to the last safe boundary and keep the rest for the next chunk
+                if final:
+                    cut = len(buffer)
+                else:
+                    boundary = None
+                    for boundary in self.CHUNK_BOUNDARY_PATTERN.finditer(buffer, max(0, len(buffer) - 4096)):
+                        pass
+                    if boundary is None:
+                        continue
+                    cut = boundary.end()
+
+                cleaned_text = self.clean_chunk(buffer[:cut])
+                buffer = buffer[cut:]
+
+                if not started:
+                    cleaned_text = cleaned_text.lstrip()
+                    started = bool(cleaned_text)
+
+                if cleaned_text.strip():
+                    output.write((" " if pending_space else "") + cleaned_text.rstrip())
+                    pending_space = cleaned_text[-1].isspace()
+                elif cleaned_text:
+                    pending_space = True
+
+                if final:
+                    break
+
+        return None
+
+
+    # Function to get the cleaning settings (part of the key of every cleaned book)
+    def get_settings(self):
+        return (self.CORPUS_CACHE_VERSION, self.ED_PATTERN, self.HYPHEN_PATTERN, self.WHITESPACE_PATTERN)
+
+
+    # Function to get the key of a cleaned book: hash of the raw bytes, the markers and the cleaning settings
+    def get_book_key(self, book):
+
+        file_name, start_marker, end_marker, cache_file = book
+
+        sha = hashlib.sha256()
+        sha.update(repr((self.get_settings(), start_marker, end_marker)).encode('UTF-8'))
+
+        file_path = os.path.join(self.corpus_dir, file_name)
+
+        if os.path.exists(file_path):
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                    sha.update(chunk)
+        else:
+            sha.update(b'<missing>')
+
+        return sha.hexdigest()
+
+
+    # Function to load the keys of the cleaned books (cache file -> key)
+    def load_processed_manifest(self):
+
+        manifest_path = os.path.join(self.processed_dir, self.processed_manifest_file)
+
+        try:
+            with open(manifest_path, 'r', encoding = 'UTF-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+
+    # Function to save the keys of the cleaned books
+    def save_processed_manifest(self, processed_manifest):
+
+        manifest_path = os.path.join(self.processed_dir, self.processed_manifest_file)
+        temp_file_path = manifest_path + ".tmp"
+
+        with open(temp_file_path, 'w', encoding = 'UTF-8') as f:
+            json.dump(processed_manifest, f, indent = 4, sort_keys = True)
+            f.write("\n")
+
+        os.replace(temp_file_path, manifest_path)
+
+
+    # Function to clean the books whose raw text, markers or cleaning settings changed (in parallel)
+    # Returns cache file -> error message for the books that could not be cleaned
+    def process_books(self, books):
+
+        processed_manifest = self.load_processed_manifest()
+        keys = {book[3]: self.get_book_key(book) for book in books}
+
+        stale_books = [
+            book for book in books
+            if processed_manifest.get(book[3]) != keys[book[3]]
+            or not os.path.exists(os.path.join(self.processed_dir, book[3]))
+        ]
+
+        for book in books:
+            if book not in stale_books:
+                logging.info(f"Using cached file: {os.path.join(self.processed_dir, book[3])}")
+
+        if not stale_books:
+            return {}
+
+        workers = min(self.workers or os.cpu_count() or 1, len(stale_books))
+        tasks = [(self.corpus_dir, self.processed_dir, self.chunk_size, book) for book in stale_books]
+
+        # Spawned, not forked, as the corpus may be built from a thread of the GUI
+        if workers > 1:
+            with multiprocessing.get_context("spawn").Pool(workers) as pool:
+                results = pool.starmap(_build_book, tasks)
+        else:
+            results = [_build_book(*task) for task in tasks]
+
+        errors = {}
+
+        for cache_file, error in results:
+            if error is None:
+                processed_manifest[cache_file] = keys[cache_file]
+            else:
+                processed_manifest.pop(cache_file, None)
+                errors[cache_file] = error
+
+        self.save_processed_manifest(processed_manifest)
+
+        return errors
+
+
+    # Function to write the clean main contents of one book to its cache file (returns an error message or None)
+    def write_clean_contents_file(self, start_marker, end_marker, cache_file, file_name):
+
+        cache_file_path = os.path.join(self.processed_dir, cache_file)
+
+        # Write to a temporary file first so a failed book never leaves a half-written cache behind
+        temp_file_path = cache_file_path + ".tmp"
+
+        try:
+            with open(temp_file_path, 'w', encoding='UTF-8') as f:
+                error = self.stream_clean_contents(file_name, start_marker, end_marker, f)
+
+        except FileNotFoundError:
+            logging.warning(f"File {file_name} not found in {self.corpus_dir}. Skipping.")
+            error = "Second occurrence of the start marker not found."
+
+        except Exception as e:
+            logging.error(f"Error reading {file_name}: {e}. Skipping.")
+            error = "Second occurrence of the start marker not found."
+
+        if error is not None:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+            return error
+
+        os.replace(temp_file_path, cache_file_path)
+
+        return None
+
+
     # Get clean main contents and save to a file
-    def get_clean_contents(self, start_marker, end_marker, cache_file = 'cleaned_main_contents.txt'):
+    def get_clean_contents(self, start_marker, end_marker, cache_file = 'cleaned_main_contents.txt', file_name = None):
 
         cache_file_path = os.path.join(self.processed_dir, cache_file)
 
+        # A streamed book is checked against its key, so a changed book or cleaning rule is processed again
+        if self.streaming and file_name is not None:
+
+            error = self.process_books([(file_name, start_marker, end_marker, cache_file)]).get(cache_file)
+            if error is not None:
+                return error
+
+            with open(cache_file_path, 'r', encoding='UTF-8') as f:
+                return f.read()
+
         if os.path.exists(cache_file_path) and os.path.getsize(cache_file_path) > 0:
             logging.info(f"Using cached file: {cache_file_path}")
             with open(cache_file_path, 'r', encoding='UTF-8') as f:
@@ -122,32 +381,106 @@ class CorpusBuilder:
         return cleaned_body_text
 
 
+    # Function to get the paths of every file the corpus is built from
+    def get_corpus_files(self):
+        return (
+            [os.path.join(self.corpus_dir, file_name) for file_name in self.files] +
+            [os.path.join(self.processed_dir, cache_file) for cache_file in self.cache_files] +
+            self.get_ingested_files()
+        )
+
+
+    # Function to get the paths of the cleaned texts added with ingest
+    def get_ingested_files(self):
+
+        if not os.path.isdir(self.ingested_dir):
+            return []
+
+        return sorted(
+            os.path.join(self.ingested_dir, file_name)
+            for file_name in os.listdir(self.ingested_dir) if file_name.endswith(".txt")
+        )
+
+
+    # Function to clean new corpus text (given as text, or as the path of a text file) and keep it with the corpus
+    # Returns the cleaned text, or None if the same text was added before
+    def add_ingested_text(self, text = None, path = None):
+
+        if (text is None) == (path is None):
+            raise ValueError("Give either the text or the path of a text file to ingest.")
+
+        if path is not None:
+            with open(path, 'r', encoding = 'UTF-8') as f:
+                text = f.read()
+
+        cleaned_text = self.text_cleaning(text)
+
+        # Named by the hash of the cleaned text, so adding the same text twice is a no-op
+        file_path = os.path.join(self.ingested_dir, hashlib.sha256(cleaned_text.encode('UTF-8')).hexdigest() + ".txt")
+
+        if os.path.exists(file_path):
+            logging.info(f"Text already ingested: {file_path}")
+            return None
+
+        os.makedirs(self.ingested_dir, exist_ok = True)
+
+        temp_file_path = file_path + ".tmp"
+        with open(temp_file_path, 'w', encoding = 'UTF-8') as f:
+            f.write(cleaned_text)
+        os.replace(temp_file_path, file_path)
+
+        return cleaned_text
+
+
+    # Function to get the (file name, start marker, end marker, cache file) of every book
+    def get_books(self):
+        return [(book["file"], book["start_marker"], book["end_marker"], book["cache_file"]) for book in self.books]
+
+
+    # Function to merge the cleaned books into the merged corpus file without holding them in memory
+    def merge_cleaned_corpora_file(self):
+
+        merged_file_path = os.path.join(self.processed_dir, "merged_cleaned_corpus.txt")
+        temp_file_path = merged_file_path + ".tmp"
+
+        # Clean the new and changed books first
+        errors = self.process_books(self.get_books())
+
+        with open(temp_file_path, 'w', encoding='UTF-8') as merged_file:
+
+            for i, (file_name, start_marker, end_marker, cache_file) in enumerate(self.get_books()):
+
+                # Same separator as "\n".join
+                if i > 0:
+                    merged_file.write("\n")
+
+                error = errors.get(cache_file)
+
+                if error is not None:
+                    merged_file.write(error)
+                    continue
+
+                with open(os.path.join(self.processed_dir, cache_file), 'r', encoding='UTF-8') as f:
+                    shutil.copyfileobj(f, merged_file, self.chunk_size)
+
+        os.replace(temp_file_path, merged_file_path)
+
+        logging.info(f"Merged corpus saved at {merged_file_path}")
+
+        return merged_file_path
+
+
     # Function to merge cleaned corpus
     def merge_cleaned_corpora(self):
-        
+
+        if self.streaming:
+            with open(self.merge_cleaned_corpora_file(), 'r', encoding='UTF-8') as f:
+                return f.read()
+
         # Get cleaned contents for each corpus
         contents = [
-            
-            # Corpus 1
-            self.get_clean_contents(
-                start_marker = r'Chapter 1: What is Manipulation?',
-                end_marker = "END OF INTRODUCTION TO PSYCHOLOGY",
-                cache_file = "corpus1_cleaned.txt"
-            ),
-
-            # Corpus 2
-            self.get_clean_contents(
-                start_marker = r'Chapter 1: The Dark Side of Psychology',
-                end_marker = "END OF HOW TO ANALYZE PEOPLE WITH DARK PSYCHOLOGY",
-                cache_file = "corpus2_cleaned.txt"
-            ),
-
-            # Corpus 3
-            self.get_clean_contents(
-                start_marker = r'Chapter 1: Delving into Dark Psychology',
-                end_marker = "END OF MOH",
-                cache_file = "corpus3_cleaned.txt"
-            ),
+            self.get_clean_contents(start_marker, end_marker, cache_file)
+            for file_name, start_marker, end_marker, cache_file in self.get_books()
         ]
 
         # Merge all 3 corpus into a single corpus
@@ -160,4 +493,3 @@ class CorpusBuilder:
         logging.info(f"Merged corpus saved at {merged_file_path}")
 
         return merged_corpus
-        
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module to Build the Deletion Index for Candidate Generation (SymSpell-style)
+"""
+
+import gc
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+
+
+class DeletionIndex:
+
+    # Precompute the delete-neighbourhood of every word in the lexicon
+    def __init__(self, words, max_distance = 3):
+
+        self.max_distance = max_distance
+
+        # Keep the iteration order of the lexicon so candidates come back in the same order as a full scan
+        self.words = list(words)
+
+        # Delete variant -> ids of the words that produce it
+        self.deletes = {}
+
+        for word_id, word in enumerate(self.words):
+            for variant in self.get_deletes(word):
+                word_ids = self.deletes.get(variant)
+                if word_ids is None:
+                    self.deletes[variant] = [word_id]
+                else:
+                    word_ids.append(word_id)
+
+
+    # Function to add a word to the index (it gets the next id, so it comes last among equal candidates)
+    def add(self, word):
+
+        word_id = len(self.words)
+        self.words.append(word)
+
+        for variant in self.get_deletes(word):
+            word_ids = self.deletes.get(variant)
+            if word_ids is None:
+                self.deletes[variant] = [word_id]
+            else:
+                word_ids.append(word_id)
+
+
+    # Function to create an index over existing tables (e.g. memory-mapped from a model file)
+    @classmethod
+    def from_tables(cls, words, deletes, max_distance = 3):
+
+        deletion_index = cls.__new__(cls)
+
+        deletion_index.max_distance = max_distance
+        deletion_index.words = words        # Sequence of words by id
+        deletion_index.deletes = deletes    # Mapping-like delete variant -> word ids (supports .get)
+
+        return deletion_index
+
+
+    # Function to load the index of the words from a cache file, building and saving it when the words changed
+    # (the psychology dictionary has about 1.08M delete variants, about 169 MB in memory either way:
+    # building takes about 1.8 s and loading about 0.5 s; a model file memory-maps them instead)
+    @classmethod
+    def load(cls, words, max_distance = 3, cache_file = os.path.join("Models", "deletion_index.pkl")):
+
+        cache_key = cls.get_cache_key(words, max_distance)
+
+        if os.path.exists(cache_file):
+            try:
+                # Unpickling the many small posting lists is mostly spent in the garbage collector
+                gc_enabled = gc.isenabled()
+                gc.disable()
+
+                try:
+                    with open(cache_file, 'rb') as f:
+                        cached_index = pickle.load(f)
+                finally:
+                    if gc_enabled:
+                        gc.enable()
+
+                if cached_index["cache_key"] == cache_key:
+                    logging.info(f"Using cached deletion index: {cache_file}")
+                    return cls.from_tables(cached_index["words"], cached_index["deletes"], max_distance)
+
+                logging.info("Dictionary changed. Rebuilding the deletion index.")
+
+            except Exception as e:
+                logging.warning(f"Error reading {cache_file}: {e}. Rebuilding.")
+
+        deletion_index = cls(words, max_distance)
+        deletion_index.save(cache_file, cache_key)
+
+        return deletion_index
+
+
+    # Function to save the tables of the index with the key of the words they were built from
+    def save(self, cache_file, cache_key):
+
+        directory, file_name = os.path.split(os.path.abspath(cache_file))
+        os.makedirs(directory, exist_ok = True)
+
+        # A temporary file of its own, so processes saving the same index never share one
+        fd, temp_file_path = tempfile.mkstemp(prefix = file_name + ".", suffix = ".tmp", dir = directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({"cache_key": cache_key, "words": self.words, "deletes": self.deletes}, f,
+                            protocol = pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_file_path, cache_file)
+
+        except BaseException:
+            os.remove(temp_file_path)
+            raise
+
+
+    # Function to get the key of a set of words (independent of their iteration order) and the maximum distance
+    @staticmethod
+    def get_cache_key(words, max_distance):
+
+        sha = hashlib.sha256()
+        sha.update(repr(max_distance).encode('UTF-8'))
+        sha.update("\n".join(sorted(words)).encode('UTF-8'))
+
+        return sha.hexdigest()
+
+
+    # Function to generate all strings reachable with up to max_distance deletions (including the word itself)
+    def get_deletes(self, word):
+
+        variants = {word}
+        level = {word}
+
+        for _ in range(self.max_distance):
+            next_level = set()
+            for variant in level:
+                for i in range(len(variant)):
+                    next_level.add(variant[:i] + variant[i + 1:])
+            variants |= next_level
+            level = next_level
+
+        return variants
+
+
+    # Function to get every word that may be within max_distance of the token
+    def lookup(self, token):
+
+        word_ids = set()
+
+        # Two strings within an edit distance of k always share a delete variant of at most k deletions each
+        for variant in self.get_deletes(token):
+            matches = self.deletes.get(variant)
+            if matches:
+                word_ids.update(matches)
+
+        # Candidates still need to be verified with the exact distance by the caller
+        return [self.words[word_id] for word_id in sorted(word_ids)]
@@ -2,7 +2,7 @@
 NAME: CHEAH WENG HOE
 TP NUMBER: TP055533
 Date Created: 24/12/2024
-Date Modified: 24/12/2024
+Date Modified: 18/10/2026
 
 Module to build the dictionary
 """
@@ -12,10 +12,13 @@ import nltk
 
 from Class.corpus_builder import CorpusBuilder
 from Class.tokens_cleaning import TokenCleaner
+from Class.lexicon import Lexicon
+from Class.phonetic_index import PhoneticIndex
 
 class DictionaryBuilder:
     
-    def __init__(self, dict_cache_file = 'dictionary.txt', psy_dict_cache_file = 'psychology_dictionary.txt'):
+    def __init__(self, dict_cache_file = 'dictionary.txt', psy_dict_cache_file = 'psychology_dictionary.txt',
+                 metaphone_cache_file = 'psychology_dictionary_metaphone.txt'):
         
         # Directory to store dictionary files
         self.dict_dir = "Dictionary"
@@ -24,6 +27,7 @@ class DictionaryBuilder:
         # Define full paths for dictionary files
         self.dict_cache_file_path = os.path.join(self.dict_dir, dict_cache_file)
         self.psy_dict_cache_file_path = os.path.join(self.dict_dir, psy_dict_cache_file)
+        self.metaphone_cache_file_path = os.path.join(self.dict_dir, metaphone_cache_file)
 
         # Check if the cache files need to be rebuilt
         if (not os.path.exists(self.dict_cache_file_path) or os.path.getsize(self.dict_cache_file_path) == 0 or
@@ -36,13 +40,19 @@ class DictionaryBuilder:
             # Get corpus 
             cleaned_body_text = corpus_builder.merge_cleaned_corpora()
             
+            # Texts added with ingest
+            tokens = cleaned_body_text.split()
+            for file_path in corpus_builder.get_ingested_files():
+                with open(file_path, 'r', encoding='UTF-8') as f:
+                    tokens.extend(f.read().split())
+
             # Clean tokens
-            cleaned_tokens = token_cleaner.clean_tokens_dict(cleaned_body_text.split())
+            cleaned_tokens = token_cleaner.clean_tokens_dict(tokens)
             
             # Build dictionaries
             self.psy_dict = set(cleaned_tokens)
             general_eng_dict = set(w.lower() for w in nltk.corpus.words.words())
-            self.dict = self.psy_dict.union(general_eng_dict)
+            self.dict = Lexicon(self.psy_dict.union(general_eng_dict))
             
             # Save dictionaries to files
             self._save_dictionary_to_file(self.dict, self.dict_cache_file_path)
@@ -51,9 +61,12 @@ class DictionaryBuilder:
         else:
             
             # Load dictionaries from cache files
-            self.dict = self._load_dictionary_from_file(self.dict_cache_file_path)
+            self.dict = Lexicon(self._load_dictionary_from_file(self.dict_cache_file_path))
             self.psy_dict = self._load_dictionary_from_file(self.psy_dict_cache_file_path)
 
+        # Double Metaphone encodings of the psychology dictionary (computed once and cached)
+        self.phonetic_index = PhoneticIndex(self._load_metaphone_codes())
+
     
     # Function to save dictionary to a file
     def _save_dictionary_to_file(self, dictionary, file_path):
@@ -68,13 +81,68 @@ class DictionaryBuilder:
             return set(line.strip() for line in f)
 
     
+    # Function to load the Double Metaphone encodings, rebuilding the cache file if it does not match psy_dict
+    def _load_metaphone_codes(self):
+
+        codes = {}
+
+        if os.path.exists(self.metaphone_cache_file_path):
+            with open(self.metaphone_cache_file_path, 'r', encoding='UTF-8') as f:
+                for line in f:
+                    word, primary, secondary = line.rstrip('\n').split('\t')
+                    codes[word] = (primary, secondary)
+
+        if codes.keys() != self.psy_dict:
+
+            codes = PhoneticIndex.encode_words(self.psy_dict)
+
+            with open(self.metaphone_cache_file_path, 'w', encoding='UTF-8') as f:
+                for word in sorted(codes):
+                    f.write(f"{word}\t{codes[word][0]}\t{codes[word][1]}\n")
+
+        return codes
+
+    
     # Function to add new words to dictionary
     def add_word_to_dict(self, word):
         word = word.lower()
-        if word not in self.dict:
-            self.dict.add(word)
+
+        # Lexicon keeps its sorted order on insert, so every consumer sees the new word
+        if self.dict.add(word):
             with open(self.dict_cache_file_path, 'a', encoding = 'UTF-8') as f:
                 f.write(word + '\n')
+            return True
+
+        return False
+
+    
+    # Function to add the words of new corpus text to the psychology dictionary (returns the new words)
+    def add_psy_words(self, words):
+
+        new_words = sorted(set(words) - self.psy_dict)
+
+        if not new_words:
+            return []
+
+        self.psy_dict.update(new_words)
+
+        with open(self.psy_dict_cache_file_path, 'a', encoding='UTF-8') as f:
+            for word in new_words:
+                f.write(word + '\n')
+
+        with open(self.metaphone_cache_file_path, 'a', encoding='UTF-8') as f:
+            for word in new_words:
+                primary, secondary = self.phonetic_index.add(word)
+                f.write(f"{word}\t{primary}\t{secondary}\n")
+
+        # The general dictionary holds every psychology word as well
+        added_words = [word for word in new_words if self.dict.add(word)]
+
+        with open(self.dict_cache_file_path, 'a', encoding = 'UTF-8') as f:
+            for word in added_words:
+                f.write(word + '\n')
+
+        return new_words
 
     
     # Function to get dictionary
@@ -84,9 +152,19 @@ class DictionaryBuilder:
     
     # Function to get sorted dictionary
     def get_sorted_dict(self):
-        return sorted(self.dict)
+        return list(self.dict)    # Lexicon iterates in sorted order
+
+    
+    # Function to get the lexicon (shared by the model and the GUI)
+    def get_lexicon(self):
+        return self.dict
 
     
     # Function to get psychology dictionary
     def get_psy_dict(self):
-        return self.psy_dict
\ No newline at end of file
+        return self.psy_dict
+
+    
+    # Function to get the Double Metaphone index of the psychology dictionary
+    def get_phonetic_index(self):
+        return self.phonetic_index
@@ -0,0 +1,95 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module to Compute the Damerau-Levenshtein (Optimal String Alignment) Distance
+with a Bit-Parallel Algorithm (Myers / Hyyro)
+"""
+
+
+class EditDistance:
+
+    # Function to build the match bit-masks of a pattern (bit i is set where pattern[i] == char)
+    def get_match_masks(self, pattern):
+
+        match_masks = {}
+
+        for i, char in enumerate(pattern):
+            match_masks[char] = match_masks.get(char, 0) | (1 << i)
+
+        return match_masks
+
+
+    # Function to compute the distance of a text against a prepared pattern
+    def _bit_parallel_distance(self, match_masks, pattern_len, text, max_distance):
+
+        text_len = len(text)
+
+        # Distance from or to an empty string is the length of the other string
+        if pattern_len == 0:
+            return text_len if max_distance is None or text_len <= max_distance else max_distance + 1
+
+        # Length difference is a lower bound of the distance
+        if max_distance is not None and abs(pattern_len - text_len) > max_distance:
+            return max_distance + 1
+
+        mask = (1 << pattern_len) - 1
+        last_bit = 1 << (pattern_len - 1)
+
+        # Vertical deltas of the DP column (all +1 for the first column)
+        vp = mask
+        vn = 0
+        d0 = 0
+        prev_match = 0
+        score = pattern_len
+
+        for j, char in enumerate(text):
+
+            match = match_masks.get(char, 0)
+
+            # Transposition of the previous and current characters
+            transposition = (((~d0) & match) << 1) & prev_match
+
+            # Diagonal zero deltas
+            d0 = ((((match & vp) + vp) ^ vp) | match | vn | transposition) & mask
+
+            # Horizontal deltas
+            hp = (vn | ~(d0 | vp)) & mask
+            hn = d0 & vp
+
+            # Track the distance in the last row
+            if hp & last_bit:
+                score += 1
+            elif hn & last_bit:
+                score -= 1
+
+            # Early exit once the remaining characters can no longer bring the distance under the limit
+            if max_distance is not None and score - (text_len - j - 1) > max_distance:
+                return max_distance + 1
+
+            # Vertical deltas for the next column
+            hp = ((hp << 1) | 1) & mask
+            hn = (hn << 1) & mask
+            vn = hp & d0
+            vp = (hn | ~(hp | d0)) & mask
+            prev_match = match
+
+        return score
+
+
+    # Function to compute the distance between two strings
+    # Returns max_distance + 1 as soon as the distance is known to exceed max_distance
+    def distance(self, s1, s2, max_distance = None):
+        return self._bit_parallel_distance(self.get_match_masks(s1), len(s1), s2, max_distance)
+
+
+    # Function to compute the distance between one token and many words in one call
+    def distance_many(self, token, words, max_distance = None):
+
+        # The match masks of the token are shared by every comparison
+        match_masks = self.get_match_masks(token)
+        token_len = len(token)
+
+        return [self._bit_parallel_distance(match_masks, token_len, word, max_distance) for word in words]
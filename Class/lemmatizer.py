@@ -0,0 +1,107 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module for Cached Lemmatisation of Out-of-Dictionary Tokens
+(WordNet is warmed up in the background and lemmas are memoised across checks)
+"""
+
+import logging
+import threading
+
+from textblob import Word
+
+from Class.lru_cache import LRUCache
+
+
+class Lemmatizer:
+
+    def __init__(self, lexicon, cache_size = 65536):
+        self.lexicon = lexicon
+
+        # token -> lemma, and token -> whether its lemma is in the lexicon
+        self.lemma_cache = LRUCache(cache_size)
+        self.known_cache = LRUCache(cache_size)
+
+        # WordNet is loaded lazily by the first lemmatisation, one thread at a time
+        self.lock = threading.Lock()
+        self.warm_up_thread = None
+
+
+    # Function to load WordNet in a background thread (a check started meanwhile waits for it)
+    def warm_up(self):
+
+        if self.warm_up_thread is None:
+            self.warm_up_thread = threading.Thread(target = self._load_wordnet, name = "wordnet-warm-up", daemon = True)
+            self.warm_up_thread.start()
+
+        return self.warm_up_thread
+
+
+    # Function to trigger the lazy WordNet load with a throwaway lemmatisation
+    def _load_wordnet(self):
+        try:
+            with self.lock:
+                Word("warming").lemmatize()
+        except Exception as e:
+            # The same error is raised again by the first real lemmatisation
+            logging.warning(f"WordNet warm-up failed: {e}")
+
+
+    # Function to update the lexicon (lemmas stay valid, but a new word can make a lemma known)
+    def update_lexicon(self, lexicon):
+        self.lexicon = lexicon
+        self.known_cache.clear()
+
+
+    # Function to get the lemma of a token
+    def lemmatize(self, token):
+        return self.lemmatize_many([token])[0]
+
+
+    # Function to get the lemmas of many tokens (WordNet is only called for tokens not seen before)
+    def lemmatize_many(self, tokens):
+
+        lemmas = [self.lemma_cache.get(token) for token in tokens]
+        missing = [i for i, lemma in enumerate(lemmas) if lemma is None]
+
+        if missing:
+            with self.lock:
+                for i in missing:
+                    lemma = Word(tokens[i]).lemmatize()
+                    self.lemma_cache.put(tokens[i], lemma)
+                    lemmas[i] = lemma
+
+        return lemmas
+
+
+    # Function to get the tokens whose lemma is not in the lexicon either
+    def get_unknown(self, tokens):
+
+        unknown = set()
+        missing = []
+
+        for token in set(tokens):
+            known = self.known_cache.get(token)
+            if known is None:
+                missing.append(token)
+            elif not known:
+                unknown.add(token)
+
+        for token, lemma in zip(missing, self.lemmatize_many(missing)):
+            known = lemma in self.lexicon
+            self.known_cache.put(token, known)
+            if not known:
+                unknown.add(token)
+
+        return unknown
+
+
+    # Function to get the hit / miss / eviction counters of the caches
+    def stats(self):
+        return {
+            "lemmas": self.lemma_cache.stats(),
+            "known": self.known_cache.stats()
+        }
@@ -0,0 +1,85 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module for the Lexicon (hashed membership and sorted lookup over one set of words)
+"""
+
+import bisect
+
+
+class Lexicon:
+
+    def __init__(self, words = ()):
+
+        # Hashed set for O(1) membership
+        self.words = set(words)
+
+        # Sorted list for rank, bisect and prefix lookups
+        self.sorted_words = sorted(self.words)
+
+
+    # Membership check
+    def __contains__(self, word):
+        return word in self.words
+
+
+    # Ordered iteration
+    def __iter__(self):
+        return iter(self.sorted_words)
+
+
+    def __len__(self):
+        return len(self.sorted_words)
+
+
+    # Word at a given rank
+    def __getitem__(self, index):
+        return self.sorted_words[index]
+
+
+    # Function to add a word, keeping the sorted order without re-sorting
+    def add(self, word):
+
+        if word in self.words:
+            return False
+
+        self.words.add(word)
+        bisect.insort(self.sorted_words, word)
+
+        return True
+
+
+    # Function to get the rank at which a word is (or would be) in the sorted order
+    def rank(self, word):
+        return bisect.bisect_left(self.sorted_words, word)
+
+
+    # Function to get the position of a word in the sorted order (like list.index)
+    def index(self, word):
+
+        if word not in self.words:
+            raise ValueError(f"{word} is not in lexicon")
+
+        return self.rank(word)
+
+
+    # Function to get the [start, end) range of the words starting with the prefix
+    def prefix_range(self, prefix):
+
+        start = bisect.bisect_left(self.sorted_words, prefix)
+
+        # Every word with the prefix sorts before prefix + the highest code point
+        end = bisect.bisect_left(self.sorted_words, prefix + chr(0x10FFFF), start)
+
+        return start, end
+
+
+    # Function to get the words starting with the prefix, in sorted order
+    def words_with_prefix(self, prefix):
+
+        start, end = self.prefix_range(prefix)
+
+        return self.sorted_words[start:end]
@@ -0,0 +1,71 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module for a Bounded LRU Cache with Hit / Miss / Eviction Counters
+"""
+
+import collections
+
+
+class LRUCache:
+
+    def __init__(self, maxsize = 4096):
+        self.maxsize = maxsize      # 0 disables caching
+        self.entries = collections.OrderedDict()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    # Function to get a cached value (marks it as recently used)
+    def get(self, key, default = None):
+
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+
+    # Function to cache a value, evicting the least recently used entry when full
+    def put(self, key, value):
+
+        if self.maxsize <= 0:
+            return
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+
+
+    # Function to drop every entry (the counters are kept)
+    def clear(self):
+        self.entries.clear()
+
+
+    # Function to get the counters
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
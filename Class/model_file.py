@@ -0,0 +1,353 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module to Save and Memory-Map the Compiled Spell Check Model
+(lexicon, psychology dictionary, deletion index and n-gram store in one file)
+
+Every table is a flat, 8-byte aligned section of the file, so processes opening the
+same file share one physical copy through the page cache and read it without copying.
+"""
+
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+
+from Class.deletion_index import DeletionIndex
+from Class.n_gram_store import NGramStore
+from Class.phonetic_index import PhoneticIndex
+
+
+class StringTable:
+
+    # Number of looked-up words remembered per process (the cache is cleared when full)
+    LOOKUP_CACHE_SIZE = 65536
+
+    # Sorted strings stored as one UTF-8 blob plus start offsets (read-only Lexicon over the file)
+    def __init__(self, blob, blob_start, offsets):
+        self.blob = blob                # mmap (or bytes) holding the blob
+        self.blob_start = blob_start    # Position of the blob in the buffer
+        self.offsets = offsets          # len(table) + 1 offsets into the blob
+        self.lookup_cache = {}          # Word -> index (-1 if not stored) of recent look-ups
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        return self._get_bytes(index).decode('UTF-8')
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    # Encoded string at an index
+    def _get_bytes(self, index):
+        return self.blob[self.blob_start + self.offsets[index]:self.blob_start + self.offsets[index + 1]]
+
+    # Binary search on the encoded strings (UTF-8 byte order is the same as code point order)
+    def _bisect_left(self, encoded, lo = 0):
+
+        hi = len(self)
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get_bytes(mid) < encoded:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    # Function to get the index of a word (None if not stored), like dict.get
+    def get(self, word, default = None):
+
+        index = self.lookup_cache.get(word)
+
+        if index is None:
+            encoded = word.encode('UTF-8')
+            index = self._bisect_left(encoded)
+
+            if index >= len(self) or self._get_bytes(index) != encoded:
+                index = -1
+
+            if len(self.lookup_cache) >= self.LOOKUP_CACHE_SIZE:
+                self.lookup_cache.clear()
+            self.lookup_cache[word] = index
+
+        return default if index < 0 else index
+
+    # Function to get the rank at which a word is (or would be) in the sorted order
+    def rank(self, word):
+        return self._bisect_left(word.encode('UTF-8'))
+
+    # Function to get the position of a word in the sorted order (like list.index)
+    def index(self, word):
+
+        index = self.get(word)
+        if index is None:
+            raise ValueError(f"{word} is not in lexicon")
+
+        return index
+
+    # Function to get the [start, end) range of the words starting with the prefix
+    def prefix_range(self, prefix):
+
+        start = self.rank(prefix)
+        end = self._bisect_left((prefix + chr(0x10FFFF)).encode('UTF-8'), start)
+
+        return start, end
+
+    # Function to get the words starting with the prefix, in sorted order
+    def words_with_prefix(self, prefix):
+
+        start, end = self.prefix_range(prefix)
+
+        return [self[index] for index in range(start, end)]
+
+
+class MappedPostings:
+
+    # Mapping of the strings of a table to slices of a postings array (optionally resolved to words)
+    def __init__(self, keys, postings_offsets, postings, words = None):
+        self.keys = keys
+        self.postings_offsets = postings_offsets
+        self.postings = postings
+        self.words = words
+
+    # Function to get the postings of a key (None if not stored), like dict.get
+    def get(self, key, default = None):
+
+        index = self.keys.get(key)
+        if index is None:
+            return default
+
+        postings = self.postings[self.postings_offsets[index]:self.postings_offsets[index + 1]]
+
+        if self.words is not None:
+            return [self.words[word_id] for word_id in postings]
+
+        return postings
+
+
+class MappedCodes:
+
+    # Mapping of the words of a table to their (primary, secondary) Double Metaphone encodings
+    def __init__(self, words, primary_codes, secondary_codes):
+        self.words = words
+        self.primary_codes = primary_codes
+        self.secondary_codes = secondary_codes
+
+    # Function to get the encodings of a word (None if not stored), like dict.get
+    def get(self, word, default = None):
+
+        index = self.words.get(word)
+        if index is None:
+            return default
+
+        return self.primary_codes[index], self.secondary_codes[index]
+
+
+class ModelFile:
+
+    MAGIC = b'SPCKMDL1'
+    ALIGNMENT = 8
+
+    def __init__(self, file_path):
+
+        # Open the file read-only; sections are served straight from the mapping
+        with open(file_path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+        if self.mmap[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError(f"{file_path} is not a spell check model file")
+
+        header_start = len(self.MAGIC) + 8
+        header_len = int.from_bytes(self.mmap[len(self.MAGIC):header_start], 'little')
+        self.header = json.loads(self.mmap[header_start:header_start + header_len].decode('UTF-8'))
+
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{file_path} was written on a {self.header['byteorder']}-endian machine")
+
+        self.buffer = memoryview(self.mmap)
+        self.metadata = self.header["metadata"]
+
+        # Tables
+        self.lexicon = self.get_string_table("lexicon")
+        self.psy_dict = self.get_string_table("psy_dict")
+
+        deletion_words = self.get_string_table("deletion_words")
+        deletes = MappedPostings(
+            self.get_string_table("deletes"),
+            self.get_array("deletes.postings_offsets"),
+            self.get_array("deletes.postings")
+        )
+        self.deletion_index = DeletionIndex.from_tables(deletion_words, deletes, self.header["max_distance"])
+
+        codes = MappedCodes(
+            self.psy_dict,
+            self.get_string_table("metaphone_primary"),
+            self.get_string_table("metaphone_secondary")
+        )
+        words_by_code = MappedPostings(
+            self.get_string_table("metaphone_codes"),
+            self.get_array("metaphone_codes.postings_offsets"),
+            self.get_array("metaphone_codes.postings"),
+            self.psy_dict
+        )
+        self.phonetic_index = PhoneticIndex.from_tables(codes, words_by_code)
+
+        keys = {}
+        counts = {}
+        for n in self.header["orders"]:
+            keys[n] = self.get_array(f"keys.{n}")
+            counts[n] = self.get_array(f"counts.{n}")
+
+        log_probs = {}
+        for name, (n, quantised) in self.header["log_probs"].items():
+            log_probs[name] = (n, quantised, self.get_array(f"log_probs.{name}"))
+
+        vocab = self.get_string_table("vocab")
+        self.store = NGramStore.from_buffers(
+            vocab, vocab, self.get_array("unigram_counts"), keys, counts, log_probs,
+            self.header["total_tokens"], self.header["unigram_vocab_size"], self.header["id_bits"]
+        )
+
+
+    # Function to get a zero-copy view of an array section
+    def get_array(self, name):
+
+        offset, length, typecode = self.header["sections"][name]
+
+        return self.buffer[offset:offset + length].cast(typecode)
+
+
+    # Function to get a string table section
+    def get_string_table(self, name):
+
+        offset, _, _ = self.header["sections"][f"{name}.blob"]
+
+        return StringTable(self.mmap, offset, self.get_array(f"{name}.offsets"))
+
+
+    # Function to write a model file (written to a temporary file first, then moved into place)
+    @staticmethod
+    def write(file_path, lexicon, psy_dict, deletion_index, phonetic_index, store, metadata = None):
+
+        sections = []
+
+        # Add a postings list per key (ids into another table)
+        def add_postings(name, postings_by_key):
+            postings_offsets = array('Q', [0])
+            postings = array('I')
+            for key in sorted(postings_by_key):
+                postings.extend(postings_by_key[key])
+                postings_offsets.append(len(postings))
+            sections.append((f"{name}.postings_offsets", postings_offsets, 'Q'))
+            sections.append((f"{name}.postings", postings, 'I'))
+
+        # Add a sorted string table (blob + offsets)
+        def add_string_table(name, words):
+            encoded = [word.encode('UTF-8') for word in words]
+            offsets = array('Q', [0])
+            for word in encoded:
+                offsets.append(offsets[-1] + len(word))
+            sections.append((f"{name}.blob", b''.join(encoded), 'B'))
+            sections.append((f"{name}.offsets", offsets, 'Q'))
+
+        psy_words = sorted(psy_dict)
+
+        add_string_table("lexicon", sorted(lexicon))
+        add_string_table("psy_dict", psy_words)
+        add_string_table("vocab", store.vocab)
+
+        # Double Metaphone encodings aligned with the psychology dictionary, and encoding -> word ids
+        psy_codes = [phonetic_index.get_codes(word) for word in psy_words]
+        add_string_table("metaphone_primary", [codes[0] for codes in psy_codes])
+        add_string_table("metaphone_secondary", [codes[1] for codes in psy_codes])
+
+        word_ids_by_code = {}
+        for word_id, codes in enumerate(psy_codes):
+            for code in set(codes):
+                if code:
+                    word_ids_by_code.setdefault(code, []).append(word_id)
+        add_string_table("metaphone_codes", sorted(word_ids_by_code))
+        add_postings("metaphone_codes", word_ids_by_code)
+
+        # Deletion index (words keep their index order, variants are sorted for binary search)
+        add_string_table("deletion_words", deletion_index.words)
+        add_string_table("deletes", sorted(deletion_index.deletes))
+        add_postings("deletes", deletion_index.deletes)
+
+        # N-gram store
+        sections.append(("unigram_counts", array('I', store.unigram_counts), 'I'))
+        for n in store.keys:
+            sections.append((f"keys.{n}", array('Q', store.keys[n]), 'Q'))
+            sections.append((f"counts.{n}", array('I', store.counts[n]), 'I'))
+
+        log_probs = {}
+        for name, (n, quantised, values) in store.log_probs.items():
+            typecode = 'h' if quantised else 'd'
+            sections.append((f"log_probs.{name}", array(typecode, values), typecode))
+            log_probs[name] = (n, quantised)
+
+        header = {
+            "byteorder": sys.byteorder,
+            "metadata": metadata or {},
+            "max_distance": deletion_index.max_distance,
+            "orders": sorted(store.keys),
+            "log_probs": log_probs,
+            "total_tokens": store.total_tokens,
+            "unigram_vocab_size": store.unigram_vocab_size,
+            "id_bits": store.id_bits,
+            "sections": {}
+        }
+
+        # Lay out the sections after the header, each aligned for its element type
+        def align(position):
+            return -(-position // ModelFile.ALIGNMENT) * ModelFile.ALIGNMENT
+
+        # The header size depends on the offsets it stores, so place the data after a generous estimate
+        header_bytes = json.dumps(header).encode('UTF-8')
+        data_start = align(len(ModelFile.MAGIC) + 8 + len(header_bytes) + 128 * (len(sections) + 1))
+
+        position = data_start
+        for name, data, typecode in sections:
+            length = len(data) * (1 if isinstance(data, bytes) else data.itemsize)
+            header["sections"][name] = (position, length, typecode)
+            position = align(position + length)
+
+        header_bytes = json.dumps(header).encode('UTF-8')
+        if len(ModelFile.MAGIC) + 8 + len(header_bytes) > data_start:
+            raise ValueError("Model file header is larger than the space reserved for it")
+
+        # A temporary file of its own, so processes writing the same model file never share one
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        fd, temp_file_path = tempfile.mkstemp(prefix = file_name + ".", suffix = ".tmp", dir = directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(ModelFile.MAGIC)
+                f.write(len(header_bytes).to_bytes(8, 'little'))
+                f.write(header_bytes)
+
+                for name, data, typecode in sections:
+                    offset = header["sections"][name][0]
+                    f.write(b'\0' * (offset - f.tell()))
+                    f.write(data if isinstance(data, bytes) else data.tobytes())
+
+            os.replace(temp_file_path, file_path)
+
+        except BaseException:
+            os.remove(temp_file_path)
+            raise
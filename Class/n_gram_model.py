@@ -2,83 +2,156 @@
 NAME: CHEAH WENG HOE
 TP NUMBER: TP055533
 Date Created: 24/12/2024
-Date Modified: 30/12/2024
+Date Modified: 18/10/2026
 
 Module to Build n-gram Model
 """
 
+import bisect
 import collections
+import hashlib
+import heapq
+import itertools
+import logging
 import math
+import multiprocessing
+import operator
+import os
+import pickle
+import tempfile
+from array import array
 import nltk
 
 from Class.corpus_builder import CorpusBuilder
 from Class.tokens_cleaning import TokenCleaner
+from Class.n_gram_store import NGramStore
+
+
+# N-gram model of the current worker process (created once per worker by _init_worker)
+_worker_n_gram_model = None
+
+
+# Create the n-gram model in a pool worker
+def _init_worker(max_order):
+    global _worker_n_gram_model
+    _worker_n_gram_model = NGramModel(max_order = max_order)
+
+
+# Count one shard of sentences in a pool worker
+def _count_shard(sentences):
+    return _worker_n_gram_model.count_sentences(sentences, _worker_n_gram_model.max_order)
+
 
 class NGramModel:
 
-    def __init__(self):
+    # Version of the compiled model format (bump to invalidate existing caches)
+    MODEL_CACHE_VERSION = 4
+
+    # Approximate memory of one n-gram in a Counter (dict entry, key tuple and count)
+    COUNTER_ENTRY_BYTES = 160
+    # Characters of cleaned text read at a time when counting out of core
+    BLOCK_SIZE = 1 << 20
+    # Characters of sentences counted together by one worker
+    SHARD_SIZE = 1 << 18
+
+    def __init__(self, model_cache_file = 'n_gram_model.pkl', max_order = 3, quantise = False,
+                 out_of_core = False, memory_budget = 512 * 1024 * 1024, min_count = 1, workers = 1):
+        self.max_order = max_order    # Highest n-gram order to count (at least 3 for the trigram model)
+        self.quantise = quantise      # Serve seen n-grams from 16-bit quantised log-probabilities
+        self.out_of_core = out_of_core        # Count in bounded memory, spilling sorted partial counts to disk
+        self.memory_budget = memory_budget    # Approximate bytes of n-gram counts held before they are spilled
+        self.min_count = min_count            # N-grams of order 2 and up seen fewer times are pruned
+        self.workers = workers                # Processes counting the corpus shards (None: one per CPU)
         self.corpus_builder = CorpusBuilder()
         self.token_cleaner = TokenCleaner()
+        self.store = None             # N-gram counts the models were last built from
+
+        # Directory to store the compiled n-gram model
+        self.model_dir = "Models"
+        os.makedirs(self.model_dir, exist_ok = True)
+        self.model_cache_file_path = os.path.join(self.model_dir, model_cache_file)
         
     # Build Unigram Model
-    def build_unigram_model(self, cleaned_tokens, smoothing = 1):
-
-        # Unigram Counter
-        unigram_counter = collections.Counter(cleaned_tokens)
+    def build_unigram_model(self, store, smoothing = 1):
 
         # Total Number of Tokens
-        total_tokens = len(cleaned_tokens)
+        total_tokens = store.total_tokens
 
         # Vocabulary Size
-        vocab_size = len(unigram_counter)
-
-        # Building Unigram Model
-        unigram_model = {}
-
-        for token, count in unigram_counter.items():
-            smoothed_count = count + smoothing
-            smoothed_total = total_tokens + (smoothing * vocab_size)
-            prob = smoothed_count / smoothed_total
-            log_prob = math.log(prob)
-            unigram_model[token] = (prob, log_prob)
+        vocab_size = store.unigram_vocab_size
 
         # Unknown Token Probability
-        unknown_prob = smoothing / (total_tokens + (smoothing * vocab_size))
+        unknown_prob = self.get_unknown_prob(store, smoothing)
         unknown_log_prob = math.log(unknown_prob)
 
+        # Building Unigram Model (probabilities indexed by word id)
+        probs = array('d', [unknown_prob]) * len(store.vocab)
+        log_probs = array('d', [unknown_log_prob]) * len(store.vocab)
+
+        for word_id, count in enumerate(store.unigram_counts):
+            if count > 0:
+                smoothed_count = count + smoothing
+                smoothed_total = total_tokens + (smoothing * vocab_size)
+                prob = smoothed_count / smoothed_total
+                probs[word_id] = prob
+                log_probs[word_id] = math.log(prob)
+
+        word_ids = store.word_ids
+
         def unigram_model_func(token):
-            return unigram_model.get(token, (unknown_prob, unknown_log_prob))
+            word_id = word_ids.get(token)
+            if word_id is None:
+                return unknown_prob, unknown_log_prob
+            return probs[word_id], log_probs[word_id]
 
-        return unigram_model_func, unigram_counter
+        return unigram_model_func, store.get_counts(1)
+
+    # Probability of a token outside the unigram vocabulary
+    def get_unknown_prob(self, store, smoothing = 1):
+        return smoothing / (store.total_tokens + (smoothing * store.unigram_vocab_size))
 
     # Build Counter for N-Grams
     def build_counter(self, cleaned_body_text, n):
+        return self.count_ngrams(cleaned_body_text, n)[n - 1]
 
-        sentences = nltk.sent_tokenize(cleaned_body_text)
-        counter = collections.Counter()
+    # Count the unigrams and every n-gram order up to max_order in one pass over the sentences
+    def count_ngrams(self, cleaned_body_text, max_order):
+        return self.count_sentences(nltk.sent_tokenize(cleaned_body_text), max_order)
 
-        for sentence in sentences:
+    # Count the unigrams and every n-gram order up to max_order of a list of sentences
+    def count_sentences(self, sentences, max_order):
 
-            tokens = nltk.word_tokenize(sentence)
-            cleaned_tokens = self.token_cleaner.clean_tokens_n_gram(tokens)
+        # counters[n - 1] holds the n-gram counts
+        counters = [collections.Counter() for _ in range(max_order)]
 
-            padded_tokens = list(
-                nltk.pad_sequence(
-                    cleaned_tokens, n, pad_left = True, pad_right = True,
-                    left_pad_symbol = "<s>", right_pad_symbol = "</s>"
-                )
-            )
-            ngrams_tuples = list(nltk.ngrams(padded_tokens, n))
-            counter.update(ngrams_tuples)
+        # Tokenise and clean each sentence only once for all the orders
+        sentences_tokens = (nltk.word_tokenize(sentence) for sentence in sentences)
 
-        return counter
+        for cleaned_tokens in self.token_cleaner.iter_clean_sentences_n_gram(sentences_tokens):
+            self.update_counters(counters, cleaned_tokens)
 
-    # Build Bigram Model
-    def build_bigram_model(self, cleaned_body_text, unigram_counter, unigram_model, back_off_factor = 0.4):
+        return counters
 
-        bigram_counter = self.build_counter(cleaned_body_text, 2)
+    # Add the n-grams of one cleaned sentence to the counters
+    def update_counters(self, counters, cleaned_tokens):
+
+        counters[0].update(cleaned_tokens)
+
+        for n in range(2, len(counters) + 1):
+
+            # Same padding as nltk.pad_sequence(cleaned_tokens, n, pad_left = True, pad_right = True)
+            padded_tokens = ["<s>"] * (n - 1) + cleaned_tokens + ["</s>"] * (n - 1)
+            counters[n - 1].update(zip(*[padded_tokens[i:] for i in range(n)]))
+
+    # Build Bigram Model
+    def build_bigram_model(self, bigram_counter, unigram_counter, unigram_model, back_off_factor = 0.4, log_prob_table = None):
 
         def bigram_model(bigram):
+            if log_prob_table is not None:
+                log_prob = log_prob_table(bigram)
+                if log_prob is not None:
+                    return math.exp(log_prob), log_prob
+
             prev = bigram[0]
             bigram_count = bigram_counter[bigram]
             unigram_count = unigram_counter[prev]
@@ -98,11 +171,14 @@ class NGramModel:
 
 
     # Build Right Bigram Model
-    def build_bigram_model_right(self, cleaned_body_text, unigram_counter, unigram_model, back_off_factor = 0.4):
-
-        bigram_counter = self.build_counter(cleaned_body_text, 2)
+    def build_bigram_model_right(self, bigram_counter, unigram_counter, unigram_model, back_off_factor = 0.4, log_prob_table = None):
 
         def right_bigram_model(bigram):
+            if log_prob_table is not None:
+                log_prob = log_prob_table(bigram)
+                if log_prob is not None:
+                    return math.exp(log_prob), log_prob
+
             next_word = bigram[1]
             bigram_count = bigram_counter[bigram]
             unigram_count = unigram_counter[next_word]
@@ -121,11 +197,14 @@ class NGramModel:
         return right_bigram_model, bigram_counter
 
     # Build Trigram Model
-    def build_trigram_model(self, cleaned_body_text, bigram_counter, bigram_model, back_off_factor = 0.4):
-
-        trigram_counter = self.build_counter(cleaned_body_text, 3)
+    def build_trigram_model(self, trigram_counter, bigram_counter, bigram_model, back_off_factor = 0.4, log_prob_table = None):
 
         def trigram_model(trigram):
+            if log_prob_table is not None:
+                log_prob = log_prob_table(trigram)
+                if log_prob is not None:
+                    return math.exp(log_prob), log_prob
+
             bigram_prev = (trigram[0], trigram[1])
             bigram_curr = (trigram[1], trigram[2])
 
@@ -146,24 +225,461 @@ class NGramModel:
         return trigram_model, trigram_counter
 
     
-    # Build N-Gram Models
-    def n_gram_model(self):
+    # Count the unigrams up to the max_order-grams of the corpus
+    def build_counters(self):
+
+        # Count the shards in parallel (sentences are counted independently, so the sums are the same)
+        if self.get_workers() > 1:
+            counters = [collections.Counter() for _ in range(self.max_order)]
+            for shard_counters in self.iter_shard_counters():
+                self.add_counters(counters, shard_counters)
+            return counters
 
         # Get the corpus
         cleaned_body_text = self.corpus_builder.merge_cleaned_corpora()
 
-        # Get Clean Tokens
-        tokens = nltk.word_tokenize(cleaned_body_text)
-        cleaned_tokens = self.token_cleaner.clean_tokens_n_gram(tokens)
+        counters = self.count_ngrams(cleaned_body_text, self.max_order)
+
+        # Texts added with ingest are counted on their own, exactly as they were when ingested
+        for file_path in self.corpus_builder.get_ingested_files():
+            with open(file_path, 'r', encoding = 'UTF-8') as f:
+                self.add_counters(counters, self.count_ngrams(f.read(), self.max_order))
+
+        return counters
+
+
+    # Add the counts of every order to the counters
+    def add_counters(self, counters, new_counters):
+        for counter, new_counter in zip(counters, new_counters):
+            counter.update(new_counter)
+
+
+    # Hash of the corpus files and cleaning settings the counts are built from
+    def get_cache_key(self):
+
+        sha = hashlib.sha256()
+        sha.update(repr((self.MODEL_CACHE_VERSION, self.max_order, self.min_count, self.token_cleaner.get_settings())).encode('UTF-8'))
+
+        for file_path in self.corpus_builder.get_corpus_files():
+            sha.update(file_path.encode('UTF-8'))
+
+            if os.path.exists(file_path):
+                with open(file_path, 'rb') as f:
+                    sha.update(hashlib.sha256(f.read()).digest())
+            else:
+                sha.update(b'<missing>')
+
+        return sha.hexdigest()
+
+
+    # Load the n-gram store from the compiled model, rebuilding it when the inputs have changed
+    def load_store(self):
+
+        cache_key = self.get_cache_key()
+
+        if os.path.exists(self.model_cache_file_path):
+            try:
+                with open(self.model_cache_file_path, 'rb') as f:
+                    compiled_model = pickle.load(f)
+
+                if compiled_model["cache_key"] == cache_key:
+                    logging.info(f"Using compiled n-gram model: {self.model_cache_file_path}")
+                    return compiled_model["store"]
+
+                logging.info("Corpus or cleaning settings changed. Rebuilding the n-gram model.")
+
+            except Exception as e:
+                logging.warning(f"Error reading {self.model_cache_file_path}: {e}. Rebuilding.")
+
+        store = self.build_store()
+        self.precompute_log_probs(store)
+        self.save_store(store, cache_key)
+
+        return store
+
+
+    # Count the corpus and pack the counts into a store
+    def build_store(self):
+
+        if self.out_of_core:
+            return self.build_store_out_of_core()
+
+        return NGramStore(self.prune_counters(self.build_counters()))
+
+
+    # Drop the n-grams of order 2 and up seen fewer than min_count times (unigrams keep the exact totals)
+    def prune_counters(self, counters):
+
+        if self.min_count <= 1:
+            return counters
+
+        return [counters[0]] + [
+            collections.Counter({ngram: count for ngram, count in counter.items() if count >= self.min_count})
+            for counter in counters[1:]
+        ]
+
+
+    # Cleaned text files counted into the model (the merged corpus, then each ingested text on its own)
+    def get_counted_files(self):
+        return [self.corpus_builder.merge_cleaned_corpora_file()] + self.corpus_builder.get_ingested_files()
+
+
+    # Read the sentences of a text file block by block (the same sentences as nltk.sent_tokenize on the whole file)
+    def iter_file_sentences(self, file_path):
+
+        with open(file_path, 'r', encoding = 'UTF-8') as f:
+
+            pending = ""
+
+            while True:
+
+                block = f.read(self.BLOCK_SIZE)
+                pending += block
+                sentences = nltk.sent_tokenize(pending)
+
+                if not block:
+                    yield from sentences
+                    return
+
+                # The last sentence may be cut off and the boundary before it depends on its first word,
+                # so the last two sentences are tokenised again with the next block
+                if len(sentences) > 2:
+                    yield from sentences[:-2]
+                    pending = pending[pending.rfind(sentences[-2], 0, pending.rfind(sentences[-1])):]
+
+
+    # Number of processes to count with
+    def get_workers(self):
+        return self.workers or os.cpu_count() or 1
+
+
+    # Batch the sentences of the files into shards of about SHARD_SIZE characters
+    def iter_shards(self, file_paths):
+
+        shard = []
+        shard_size = 0
+
+        for file_path in file_paths:
+            for sentence in self.iter_file_sentences(file_path):
+
+                shard.append(sentence)
+                shard_size += len(sentence)
+
+                if shard_size >= self.SHARD_SIZE:
+                    yield shard
+                    shard = []
+                    shard_size = 0
+
+        if shard:
+            yield shard
+
+
+    # Count the corpus shard by shard, yielding the counters of each shard in corpus order
+    def iter_shard_counters(self):
+
+        shards = self.iter_shards(self.get_counted_files())
+        workers = self.get_workers()
+
+        if workers == 1:
+            for shard in shards:
+                yield self.count_sentences(shard, self.max_order)
+            return
+
+        # Spawned, not forked, as the model may be built from a thread of the GUI
+        context = multiprocessing.get_context("spawn")
+
+        with context.Pool(workers, initializer = _init_worker, initargs = (self.max_order,)) as pool:
+
+            # A few shards per worker in flight, so the corpus is never read far ahead of the counting
+            pending = collections.deque()
+
+            for shard in shards:
+                pending.append(pool.apply_async(_count_shard, (shard,)))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().get()
+
+            while pending:
+                yield pending.popleft().get()
+
+
+    # Count the corpus in bounded memory: partial counts are spilled as sorted runs and k-way merged
+    def build_store_out_of_core(self):
+
+        max_entries = max(1, self.memory_budget // self.COUNTER_ENTRY_BYTES)
+
+        # The unigrams stay in memory (they are bounded by the vocabulary and the store keeps them anyway)
+        counters = [collections.Counter() for _ in range(self.max_order)]
+        runs = {n: [] for n in range(2, self.max_order + 1)}
+        counted_sentences = False
+
+        with tempfile.TemporaryDirectory(prefix = "n_gram_spill_", dir = self.model_dir) as spill_dir:
+
+            for shard_counters in self.iter_shard_counters():
+                self.add_counters(counters, shard_counters)
+                counted_sentences = True
+
+                if sum(len(counter) for counter in counters[1:]) >= max_entries:
+                    self.spill_counters(counters, runs, spill_dir)
+
+            self.spill_counters(counters, runs, spill_dir)
+            logging.info(f"Merging {sum(len(run_paths) for run_paths in runs.values())} n-gram runs")
+
+            # Every counted sentence adds the padding symbols to the higher orders
+            extra_words = {"<s>", "</s>"} if counted_sentences and self.max_order > 1 else set()
+            merged_items = {n: self.merge_runs(run_paths) for n, run_paths in runs.items()}
+
+            return NGramStore.from_sorted_items(counters[0], merged_items, extra_words)
+
+
+    # Write the counts of every order from 2 as sorted run files and empty the counters
+    def spill_counters(self, counters, runs, spill_dir):
+
+        for n in range(2, len(counters) + 1):
+
+            if not counters[n - 1]:
+                continue
+
+            run_path = os.path.join(spill_dir, f"{n}-gram_{len(runs[n])}.txt")
+
+            # One n-gram per line: the words and the count separated by tabs (tokens never contain whitespace)
+            with open(run_path, 'w', encoding = 'UTF-8') as f:
+                for ngram, count in sorted(counters[n - 1].items()):
+                    f.write("\t".join(ngram) + f"\t{count}\n")
+
+            runs[n].append(run_path)
+            counters[n - 1].clear()
+
+
+    # Read the (n-gram, count) pairs of a run file in order
+    def read_run(self, run_path):
+
+        with open(run_path, 'r', encoding = 'UTF-8') as f:
+            for line in f:
+                *ngram, count = line.rstrip('\n').split('\t')
+                yield tuple(ngram), int(count)
+
+
+    # K-way merge of sorted run files, summing the counts of each n-gram and pruning below min_count
+    def merge_runs(self, run_paths):
+
+        merged = heapq.merge(*[self.read_run(run_path) for run_path in run_paths])
+
+        for ngram, group in itertools.groupby(merged, key = operator.itemgetter(0)):
+            count = sum(count for _, count in group)
+            if count >= self.min_count:
+                yield ngram, count
+
+
+    # Save the n-gram store as the compiled model of the current corpus
+    def save_store(self, store, cache_key = None):
+
+        if cache_key is None:
+            cache_key = self.get_cache_key()
+
+        # Write to a temporary file first so a crash never leaves a half-written model behind
+        temp_file_path = self.model_cache_file_path + ".tmp"
+        with open(temp_file_path, 'wb') as f:
+            pickle.dump({"cache_key": cache_key, "store": store}, f, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_path, self.model_cache_file_path)
+
+
+    # Merge the n-grams of new cleaned text into a store and save it as the compiled model
+    # (store holds the counts from before the text was added to the corpus with CorpusBuilder.add_ingested_text;
+    # with min_count, n-grams pruned from it are only counted from the new text until the next rebuild)
+    def ingest(self, cleaned_text, store):
+
+        # Only the n-grams of the new text are counted; they are merged into the sorted arrays of the store
+        store = store.merge(self.count_ngrams(cleaned_text, self.max_order), min_count = self.min_count)
+        self.precompute_log_probs(store)
+        self.save_store(store)
+
+        return store
+
+
+    # Store 16-bit log-probabilities of the seen n-grams (None where the model backs off)
+    def quantise_log_probs(self, store):
+
+        unigram_counter = store.get_counts(1)
+        bigram_counter = store.get_counts(2)
+
+        left_log_probs = []
+        right_log_probs = []
+
+        for (prev, next_word), count in store.items(2):
+            left_log_probs.append(math.log(count / unigram_counter[prev]) if unigram_counter[prev] > 0 else None)
+            right_log_probs.append(math.log(count / unigram_counter[next_word]) if unigram_counter[next_word] > 0 else None)
+
+        trigram_log_probs = []
+
+        for trigram, count in store.items(3):
+            bigram_count = bigram_counter[trigram[:2]]
+            trigram_log_probs.append(math.log(count / bigram_count) if bigram_count > 0 else None)
+
+        store.set_log_probs("bigram", 2, left_log_probs, quantise = True)
+        store.set_log_probs("right_bigram", 2, right_log_probs, quantise = True)
+        store.set_log_probs("trigram", 3, trigram_log_probs, quantise = True)
+
+    
+    # Materialise the log-probabilities the bigram, right bigram and trigram models return
+    # (every stored n-gram has its value, back-offs included, and each word has its back-off value)
+    def precompute_log_probs(self, store, back_off_factor = 0.4):
+
+        unigram_model, _ = self.build_unigram_model(store)
+
+        id_bits = store.id_bits
+        mask = (1 << id_bits) - 1
+        unigram_counts = store.unigram_counts
+        bigram_keys = store.keys[2]
+        bigram_counts = store.counts[2]
+
+        # Back-off of an unseen bigram to the unigram of its word (the last entry is for unknown words),
+        # and of an unseen trigram whose last bigram is unseen too
+        back_off_probs = [back_off_factor * unigram_model(word)[0] for word in store.vocab]
+        back_off_probs.append(back_off_factor * self.get_unknown_prob(store))
+        back_off_2_probs = [back_off_factor * prob for prob in back_off_probs]
+
+        # Stored bigrams, divided by the count of the previous (left) or next (right) word
+        bigram_probs = []
+        right_bigram_probs = []
+
+        for key, count in zip(bigram_keys, bigram_counts):
+
+            prev_id = key >> id_bits
+            next_id = key & mask
+
+            prob = count / unigram_counts[prev_id] if unigram_counts[prev_id] > 0 else 0
+            bigram_probs.append(prob if prob != 0 else back_off_probs[next_id])
+
+            prob = count / unigram_counts[next_id] if unigram_counts[next_id] > 0 else 0
+            right_bigram_probs.append(prob if prob != 0 else back_off_probs[next_id])
+
+        # Back-off of an unseen trigram to its stored last bigram
+        bigram_back_off_probs = [back_off_factor * prob for prob in bigram_probs]
+
+        # Stored trigrams, divided by the count of their first bigram (found by walking the sorted bigram keys)
+        trigram_probs = []
+        bigram_index = 0
+
+        for key, count in zip(store.keys[3], store.counts[3]):
+
+            context = key >> id_bits
+            while bigram_index < len(bigram_keys) and bigram_keys[bigram_index] < context:
+                bigram_index += 1
+
+            found = bigram_index < len(bigram_keys) and bigram_keys[bigram_index] == context
+            bigram_count = bigram_counts[bigram_index] if found else 0
+
+            prob = count / bigram_count if bigram_count > 0 else 0
+
+            if prob == 0:
+                last_bigram = key & ((1 << (2 * id_bits)) - 1)
+                index = bisect.bisect_left(bigram_keys, last_bigram)
+                if index < len(bigram_keys) and bigram_keys[index] == last_bigram:
+                    prob = bigram_back_off_probs[index]
+                else:
+                    prob = back_off_2_probs[key & mask]
+
+            trigram_probs.append(prob)
+
+        # Only the logs are kept (8 bytes per entry); the probabilities are computed from them on demand
+        for name, n, probs in (("back_off", 1, back_off_probs), ("back_off_2", 1, back_off_2_probs),
+                               ("bigram", 2, bigram_probs), ("right_bigram", 2, right_bigram_probs),
+                               ("bigram_back_off", 2, bigram_back_off_probs), ("trigram", 3, trigram_probs)):
+            store.set_log_probs(f"{name}.log_prob", n, [math.log(prob) for prob in probs])
+
+
+    # Build the bigram, right bigram and trigram models on the precomputed tables
+    # (one look-up per n-gram instead of divisions, logs and nested back-off calls)
+    def build_table_models(self, store):
+
+        def table(name):
+            return store.log_probs[f"{name}.log_prob"][2]
+
+        back_off_log_probs = table("back_off")
+        back_off_2_log_probs = table("back_off_2")
+        bigram_log_probs = table("bigram")
+        right_bigram_log_probs = table("right_bigram")
+        bigram_back_off_log_probs = table("bigram_back_off")
+        trigram_log_probs = table("trigram")
+
+        find = store.find
+        word_ids = store.word_ids
+        unknown_id = len(store.vocab)
+        exp = math.exp
+
+        def bigram_model(bigram):
+            index = find(bigram)
+            if index >= 0:
+                log_prob = bigram_log_probs[index]
+            else:
+                log_prob = back_off_log_probs[word_ids.get(bigram[1], unknown_id)]
+            return exp(log_prob), log_prob
+
+        def right_bigram_model(bigram):
+            index = find(bigram)
+            if index >= 0:
+                log_prob = right_bigram_log_probs[index]
+            else:
+                log_prob = back_off_log_probs[word_ids.get(bigram[1], unknown_id)]
+            return exp(log_prob), log_prob
+
+        def trigram_model(trigram):
+            index = find(trigram)
+            if index >= 0:
+                log_prob = trigram_log_probs[index]
+            else:
+                index = find(trigram[1:])
+                if index >= 0:
+                    log_prob = bigram_back_off_log_probs[index]
+                else:
+                    log_prob = back_off_2_log_probs[word_ids.get(trigram[2], unknown_id)]
+            return exp(log_prob), log_prob
+
+        return bigram_model, right_bigram_model, trigram_model
+
+    
+    # Build N-Gram Models (from the cached store unless a store, e.g. memory-mapped, is given)
+    def n_gram_model(self, store = None):
+
+        # Get the n-gram counts (compiled once and cached on disk)
+        if store is None:
+            store = self.load_store()
+        self.store = store
+        bigram_counter = store.get_counts(2)
+        trigram_counter = store.get_counts(3)
+
+        # Look-ups of the quantised log-probabilities
+        bigram_table = right_bigram_table = trigram_table = None
+
+        if self.quantise and "bigram" not in store.log_probs:
+            self.quantise_log_probs(store)
+
+        if "bigram" in store.log_probs:
+
+            # The quantised tables replace the exact ones
+            for name in [name for name in store.log_probs if name.endswith(".log_prob")]:
+                del store.log_probs[name]
+
+            bigram_table = lambda bigram: store.get_log_prob("bigram", bigram)
+            right_bigram_table = lambda bigram: store.get_log_prob("right_bigram", bigram)
+            trigram_table = lambda trigram: store.get_log_prob("trigram", trigram)
 
         # Building the model
         # Get the unigram model
-        unigram_model, unigram_counter = self.build_unigram_model(cleaned_tokens)
+        unigram_model, unigram_counter = self.build_unigram_model(store)
+
+        # Serve the other models from exact precomputed tables (saved with the cached store and in a model file)
+        if bigram_table is None:
+            if "trigram.log_prob" not in store.log_probs:
+                self.precompute_log_probs(store)
+            bigram_model, right_bigram_model, trigram_model = self.build_table_models(store)
+            return unigram_model, bigram_model, right_bigram_model, trigram_model
+
         # Get the bigram model
-        bigram_model, bigram_counter = self.build_bigram_model(cleaned_body_text, unigram_counter, unigram_model)
+        bigram_model, bigram_counter = self.build_bigram_model(bigram_counter, unigram_counter, unigram_model, log_prob_table = bigram_table)
         # Get the right bigram model
-        right_bigram_model, _ = self.build_bigram_model_right(cleaned_body_text, unigram_counter, unigram_model)
+        right_bigram_model, _ = self.build_bigram_model_right(bigram_counter, unigram_counter, unigram_model, log_prob_table = right_bigram_table)
         # Get the trigram model
-        trigram_model, _ = self.build_trigram_model(cleaned_body_text, bigram_counter, bigram_model)
+        trigram_model, _ = self.build_trigram_model(trigram_counter, bigram_counter, bigram_model, log_prob_table = trigram_table)
 
         return unigram_model, bigram_model, right_bigram_model, trigram_model
\ No newline at end of file
@@ -0,0 +1,345 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module for the Compact N-Gram Store (integer word ids, packed n-gram keys in sorted arrays)
+"""
+
+import bisect
+from array import array
+
+
+class NGramStore:
+
+    # Scale of the 16-bit quantised log-probabilities (resolution of 1/1000, range down to about -32.7)
+    LOG_PROB_SCALE = 1000
+    # Marker for an n-gram without a stored log-probability
+    NO_LOG_PROB = -32768
+
+    def __init__(self, counters):
+
+        # counters[n - 1] holds the n-gram counts (counters[0] are the unigrams)
+        self.max_order = len(counters)
+
+        # Vocabulary of every word in any n-gram (including the padding symbols), ids follow sorted order
+        vocab = set(counters[0])
+        for counter in counters[1:]:
+            for ngram in counter:
+                vocab.update(ngram)
+
+        self.vocab = sorted(vocab)
+        self.word_ids = {word: word_id for word_id, word in enumerate(self.vocab)}
+
+        # Bits per word id in a packed key
+        self.id_bits = max(1, (len(self.vocab) - 1).bit_length())
+        if self.id_bits * self.max_order > 64:
+            raise ValueError(f"Vocabulary of {len(self.vocab)} words is too large to pack {self.max_order}-grams in 64 bits")
+
+        # Unigram counts indexed by word id
+        self.unigram_counts = array('I', [0]) * len(self.vocab)
+        for word, count in counters[0].items():
+            self.unigram_counts[self.word_ids[word]] = count
+
+        self.total_tokens = sum(counters[0].values())
+        self.unigram_vocab_size = len(counters[0])
+
+        # Sorted packed keys and their counts for every order from 2
+        self.keys = {}
+        self.counts = {}
+
+        for n in range(2, self.max_order + 1):
+            packed = sorted((self.pack([self.word_ids[word] for word in ngram]), count) for ngram, count in counters[n - 1].items())
+            self.keys[n] = array('Q', [key for key, _ in packed])
+            self.counts[n] = array('I', [count for _, count in packed])
+
+        # Optional log-probability tables, aligned with the keys of their order
+        self.log_probs = {}
+
+
+    # Function to create a store over existing buffers (e.g. memory-mapped arrays of a model file)
+    @classmethod
+    def from_buffers(cls, vocab, word_ids, unigram_counts, keys, counts, log_probs, total_tokens, unigram_vocab_size, id_bits):
+
+        store = cls.__new__(cls)
+
+        store.vocab = vocab                  # Sequence of words by id
+        store.word_ids = word_ids            # Mapping-like word -> id (supports .get)
+        store.unigram_counts = unigram_counts
+        store.keys = keys
+        store.counts = counts
+        store.log_probs = log_probs
+        store.total_tokens = total_tokens
+        store.unigram_vocab_size = unigram_vocab_size
+        store.id_bits = id_bits
+        store.max_order = max(keys) if keys else 1
+
+        return store
+
+
+    # Function to create a store from the unigram counts and sorted streams of the higher orders
+    # (e.g. the merged runs of an out-of-core count, so the n-grams never all sit in a Counter)
+    @classmethod
+    def from_sorted_items(cls, unigram_counter, sorted_items, extra_words = ()):
+
+        store = cls.__new__(cls)
+
+        # sorted_items[n] yields the (n-gram, count) pairs of order n in ascending n-gram order
+        store.max_order = max([1] + list(sorted_items))
+
+        # Words of the higher orders are unigrams, apart from extra words such as the padding symbols
+        store.vocab = sorted(set(unigram_counter).union(extra_words))
+        store.word_ids = {word: word_id for word_id, word in enumerate(store.vocab)}
+
+        store.id_bits = max(1, (len(store.vocab) - 1).bit_length())
+        if store.id_bits * store.max_order > 64:
+            raise ValueError(f"Vocabulary of {len(store.vocab)} words is too large to pack {store.max_order}-grams in 64 bits")
+
+        store.unigram_counts = array('I', [0]) * len(store.vocab)
+        for word, count in unigram_counter.items():
+            store.unigram_counts[store.word_ids[word]] = count
+
+        store.total_tokens = sum(unigram_counter.values())
+        store.unigram_vocab_size = len(unigram_counter)
+
+        # Word ids follow the sorted vocabulary, so n-gram order is already packed key order
+        store.keys = {}
+        store.counts = {}
+
+        for n, items in sorted(sorted_items.items()):
+            store.keys[n] = array('Q')
+            store.counts[n] = array('I')
+
+            for ngram, count in items:
+                store.keys[n].append(store.pack([store.word_ids[word] for word in ngram]))
+                store.counts[n].append(count)
+
+        store.log_probs = {}
+
+        return store
+
+
+    # Function to get a new store with the counts of more text added (e.g. ingested text)
+    # Only the new n-grams are packed and sorted; the stored runs between them are copied as array slices.
+    # N-grams not stored before are dropped below min_count, as pruning the summed counts would
+    def merge(self, counters, min_count = 1):
+
+        store = NGramStore.__new__(NGramStore)
+        store.max_order = self.max_order
+
+        new_words = set()
+        for counter in counters:
+            for ngram in counter:
+                for word in ((ngram,) if isinstance(ngram, str) else ngram):
+                    if self.word_ids.get(word) is None:
+                        new_words.add(word)
+
+        store.vocab = sorted(new_words.union(self.vocab)) if new_words else list(self.vocab)
+        store.word_ids = {word: word_id for word_id, word in enumerate(store.vocab)}
+
+        store.id_bits = max(1, (len(store.vocab) - 1).bit_length())
+        if store.id_bits * store.max_order > 64:
+            raise ValueError(f"Vocabulary of {len(store.vocab)} words is too large to pack {store.max_order}-grams in 64 bits")
+
+        # New words shift the ids after them; the sorted order of the words, and so of the keys, is kept
+        remap = array('I', [store.word_ids[word] for word in self.vocab]) if new_words else None
+
+        if remap is None:
+            store.unigram_counts = array('I', self.unigram_counts)
+        else:
+            store.unigram_counts = array('I', [0]) * len(store.vocab)
+            for word_id, count in enumerate(self.unigram_counts):
+                store.unigram_counts[remap[word_id]] = count
+
+        store.unigram_vocab_size = self.unigram_vocab_size
+        for word, count in counters[0].items():
+            word_id = store.word_ids[word]
+            if store.unigram_counts[word_id] == 0 and count > 0:
+                store.unigram_vocab_size += 1
+            store.unigram_counts[word_id] += count
+
+        store.total_tokens = self.total_tokens + sum(counters[0].values())
+
+        store.keys = {}
+        store.counts = {}
+
+        for n in range(2, self.max_order + 1):
+
+            keys = self.keys[n]
+            counts = self.counts[n]
+
+            if remap is not None:
+                keys = array('Q', [self._repack(key, n, remap, store.id_bits) for key in keys])
+
+            new_items = sorted((store.pack([store.word_ids[word] for word in ngram]), count) for ngram, count in counters[n - 1].items())
+
+            merged_keys = array('Q')
+            merged_counts = array('I')
+            start = 0
+
+            for key, count in new_items:
+
+                index = bisect.bisect_left(keys, key, start)
+                merged_keys.extend(keys[start:index])
+                merged_counts.extend(counts[start:index])
+
+                if index < len(keys) and keys[index] == key:
+                    merged_keys.append(key)
+                    merged_counts.append(counts[index] + count)
+                    start = index + 1
+                else:
+                    if count >= min_count:
+                        merged_keys.append(key)
+                        merged_counts.append(count)
+                    start = index
+
+            merged_keys.extend(keys[start:])
+            merged_counts.extend(counts[start:])
+
+            store.keys[n] = merged_keys
+            store.counts[n] = merged_counts
+
+        # Log-probability tables depend on every count, so they are computed again by the caller
+        store.log_probs = {}
+
+        return store
+
+
+    # Function to pack a key again with new word ids (and possibly more bits per id)
+    def _repack(self, key, n, remap, id_bits):
+
+        mask = (1 << self.id_bits) - 1
+        new_key = 0
+
+        for k in range(n):
+            new_key = (new_key << id_bits) | remap[(key >> (self.id_bits * (n - 1 - k))) & mask]
+
+        return new_key
+
+
+    # Function to pack a sequence of word ids into one integer key
+    def pack(self, word_ids):
+
+        key = 0
+        for word_id in word_ids:
+            key = (key << self.id_bits) | word_id
+
+        return key
+
+
+    # Function to get the packed key of an n-gram (None if any word is unknown)
+    def get_key(self, ngram):
+
+        key = 0
+        for word in ngram:
+            word_id = self.word_ids.get(word)
+            if word_id is None:
+                return None
+            key = (key << self.id_bits) | word_id
+
+        return key
+
+
+    # Function to get the position of an n-gram in the arrays of its order (-1 if not stored)
+    def find(self, ngram):
+
+        n = len(ngram)
+        key = self.get_key(ngram)
+
+        if key is None or n not in self.keys:
+            return -1
+
+        keys = self.keys[n]
+        index = bisect.bisect_left(keys, key)
+
+        if index < len(keys) and keys[index] == key:
+            return index
+
+        return -1
+
+
+    # Function to get the count of a word or an n-gram tuple
+    def count(self, ngram):
+
+        if isinstance(ngram, str):
+            word_id = self.word_ids.get(ngram)
+            return 0 if word_id is None else self.unigram_counts[word_id]
+
+        index = self.find(ngram)
+
+        return 0 if index < 0 else self.counts[len(ngram)][index]
+
+
+    # Function to get a Counter-like view of one order
+    def get_counts(self, n):
+        return NGramCounts(self, n)
+
+
+    # Function to store a log-probability table for an order (None entries have no value)
+    def set_log_probs(self, name, n, log_probs, quantise = False):
+
+        if quantise:
+            self.log_probs[name] = (n, True, array('h', [
+                self.NO_LOG_PROB if log_prob is None else max(self.NO_LOG_PROB + 1, round(log_prob * self.LOG_PROB_SCALE))
+                for log_prob in log_probs
+            ]))
+        else:
+            self.log_probs[name] = (n, False, array('d', [float('nan') if log_prob is None else log_prob for log_prob in log_probs]))
+
+
+    # Function to get a stored log-probability (None if the n-gram has no value)
+    def get_log_prob(self, name, ngram):
+
+        n, quantised, values = self.log_probs[name]
+        index = self.find(ngram)
+
+        if index < 0:
+            return None
+
+        value = values[index]
+
+        if quantised:
+            return None if value == self.NO_LOG_PROB else value / self.LOG_PROB_SCALE
+
+        return None if value != value else value    # NaN marks a missing value
+
+
+    # Function to iterate over the n-grams of an order with their counts
+    def items(self, n):
+
+        if n == 1:
+            for word_id, count in enumerate(self.unigram_counts):
+                if count > 0:
+                    yield self.vocab[word_id], count
+            return
+
+        mask = (1 << self.id_bits) - 1
+
+        for key, count in zip(self.keys[n], self.counts[n]):
+            word_ids = [(key >> (self.id_bits * (n - 1 - k))) & mask for k in range(n)]
+            yield tuple(self.vocab[word_id] for word_id in word_ids), count
+
+
+class NGramCounts:
+
+    # Read-only, Counter-like view of the counts of one order in the store
+    def __init__(self, store, n):
+        self.store = store
+        self.n = n
+
+    # Missing n-grams count as 0, like collections.Counter
+    def __getitem__(self, ngram):
+        return self.store.count(ngram)
+
+    def __len__(self):
+        return self.store.unigram_vocab_size if self.n == 1 else len(self.store.keys[self.n])
+
+    def __iter__(self):
+        return (ngram for ngram, _ in self.store.items(self.n))
+
+    def items(self):
+        return self.store.items(self.n)
+
+    def values(self):
+        return (count for _, count in self.store.items(self.n))
@@ -0,0 +1,86 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module for the Double Metaphone Index of the Lexicon
+(stored encodings per word and an inverted index from encoding to words)
+"""
+
+from metaphone import doublemetaphone
+
+
+class PhoneticIndex:
+
+    # Build the index from precomputed encodings, word -> (primary, secondary)
+    def __init__(self, codes):
+
+        self.codes = codes
+
+        # Encoding -> words with that primary or secondary encoding
+        self.words_by_code = {}
+
+        for word, word_codes in codes.items():
+            for code in set(word_codes):
+                if code:
+                    self.words_by_code.setdefault(code, []).append(word)
+
+
+    # Function to add a word to the index
+    def add(self, word):
+
+        codes = self.encode_words([word])[word]
+        self.codes[word] = codes
+
+        for code in set(codes):
+            if code:
+                self.words_by_code.setdefault(code, []).append(word)
+
+        return codes
+
+
+    # Function to create an index over existing tables (e.g. memory-mapped from a model file)
+    @classmethod
+    def from_tables(cls, codes, words_by_code):
+
+        phonetic_index = cls.__new__(cls)
+
+        phonetic_index.codes = codes                    # Mapping-like word -> (primary, secondary)
+        phonetic_index.words_by_code = words_by_code    # Mapping-like encoding -> words
+
+        return phonetic_index
+
+
+    # Function to compute the encodings of every word
+    @staticmethod
+    def encode_words(words):
+        return {word: doublemetaphone(word) for word in words}
+
+
+    # Function to get the encodings of a word (stored ones for lexicon words, computed otherwise)
+    def get_codes(self, word):
+
+        codes = self.codes.get(word)
+
+        if codes is None:
+            codes = doublemetaphone(word)
+
+        return codes
+
+
+    # Function to get the lexicon words sharing an encoding with the word
+    def lookup(self, word):
+
+        words = []
+        seen = set()
+
+        for code in self.get_codes(word):
+            if not code:
+                continue
+            for match in self.words_by_code.get(code) or []:
+                if match not in seen:
+                    seen.add(match)
+                    words.append(match)
+
+        return words
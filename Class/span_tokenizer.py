@@ -0,0 +1,59 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module to Tokenise Input Text into (token, start, end) Spans in One Pass
+"""
+
+import re
+
+from nltk.tokenize.punkt import PunktTokenizer
+
+
+class SpanTokenizer:
+
+    # Words (keeping inner hyphens and apostrophes), decimal numbers, or a single other character
+    TOKEN_PATTERN = re.compile(r"\d+(?:[.,]\d+)+|\w+(?:[-'’]\w+)*|[^\w\s]")
+
+    # Contractions split off the end of a word, as nltk.word_tokenize does ("don't" -> "do", "n't")
+    CONTRACTION_PATTERN = re.compile(r"(?:n['’]t|['’](?:s|re|ve|ll|d|m))$", re.IGNORECASE)
+
+    def __init__(self, language = 'english'):
+        self.language = language
+        self.sentence_tokenizer = None      # Loaded on first use
+
+
+    # Function to get the (start, end) spans of the sentences
+    def sentence_spans(self, text):
+
+        if self.sentence_tokenizer is None:
+            self.sentence_tokenizer = PunktTokenizer(self.language)
+
+        return list(self.sentence_tokenizer.span_tokenize(text))
+
+
+    # Function to get the (token, start, end) spans of the words in text[start:end]
+    def word_spans(self, text, start = 0, end = None):
+
+        end = len(text) if end is None else end
+
+        for match in self.TOKEN_PATTERN.finditer(text, start, end):
+
+            token = match.group()
+            token_start, token_end = match.span()
+
+            contraction = self.CONTRACTION_PATTERN.search(token)
+
+            if contraction and contraction.start() > 0:
+                split = token_start + contraction.start()
+                yield token[:contraction.start()], token_start, split
+                yield token[contraction.start():], split, token_end
+            else:
+                yield token, token_start, token_end
+
+
+    # Function to get the word spans of every sentence
+    def tokenize(self, text):
+        return [list(self.word_spans(text, start, end)) for start, end in self.sentence_spans(text)]
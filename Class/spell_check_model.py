@@ -2,37 +2,95 @@
 NAME: CHEAH WENG HOE
 TP NUMBER: TP055533
 Date Created: 24/12/2024
-Date Modified: 30/12/2024
+Date Modified: 18/10/2026
 
 Module to Build the Spelling Checker Model
 """
 
+import hashlib
+import os
+import multiprocessing
 import nltk
 from nltk.util import pad_sequence
 from nltk import bigrams, trigrams
-from nltk.corpus import wordnet
-
-from metaphone import doublemetaphone
-from textblob import Word
 
 from Class.corpus_builder import CorpusBuilder
 from Class.tokens_cleaning import TokenCleaner
 from Class.dictionary_builder import DictionaryBuilder
 from Class.n_gram_model import NGramModel
+from Class.deletion_index import DeletionIndex
+from Class.phonetic_index import PhoneticIndex
+from Class.edit_distance import EditDistance
+from Class.model_file import ModelFile
+from Class.span_tokenizer import SpanTokenizer
+from Class.lru_cache import LRUCache
+from Class.lemmatizer import Lemmatizer
+
+
+# Model of the current worker process (loaded once per worker by _init_worker)
+_worker_model = None
+
+
+# Load the memory-mapped model in a pool worker
+def _init_worker(model_file, hyperparameters):
+    global _worker_model
+    _worker_model = SpellCheckModel(None, None, model_file = model_file, **hyperparameters)
+
+
+# Check one document in a pool worker
+def _check_text(text):
+    return _worker_model.error_detection(text)
 
 
 class SpellCheckModel:
 
     def __init__(self, dict, psy_dict, bi_weight, bi_right_weight, tri_weight, threshold,
-                 edit_distance_weight=1, double_metaphone_weight=1, context_score_weight=0.5, n_candidate=10):
-       
-        # Initialize dictionary
-        self.dict = dict
-        self.psy_dict = psy_dict
+                 edit_distance_weight=1, double_metaphone_weight=1, context_score_weight=0.5, n_candidate=10,
+                 model_file=None, cache_size=4096, context_cache_size=65536,
+                 phonetic_index=None, phonetic_candidates=False,
+                 quantise=False, out_of_core=False, memory_budget=512 * 1024 * 1024, min_count=1, n_gram_workers=1):
+
+        # Initialize N-Gram models (kept to merge in ingested text)
+        n_gram_model = NGramModel(quantise = quantise, out_of_core = out_of_core, memory_budget = memory_budget,
+                                  min_count = min_count, workers = n_gram_workers)
+        self.n_gram_builder = n_gram_model
+
+        # Model file shared with the batch workers (and the dictionary size it was written with)
+        self.model_file = model_file
+        self.model_file_dict_size = None
+        self.read_only = model_file is not None     # A memory-mapped model cannot be updated
+
+        if model_file is not None:
+
+            # Memory-map the compiled model (dict and psy_dict are read from the file)
+            mapped_model = ModelFile(model_file)
+            self.dict = mapped_model.lexicon
+            self.psy_dict = mapped_model.psy_dict
+            self.deletion_index = mapped_model.deletion_index
+            self.phonetic_index = mapped_model.phonetic_index
+            self.model_file_dict_size = len(self.dict)
+            self.unigram_model, self.bigram_model, self.right_bigram_model, self.trigram_model = n_gram_model.n_gram_model(mapped_model.store)
+
+        else:
+
+            # Initialize dictionary
+            self.dict = dict
+            self.psy_dict = psy_dict
+
+            # Precompute the delete-neighbourhood index for candidate generation (cached on disk per dictionary)
+            self.deletion_index = DeletionIndex.load(self.psy_dict, max_distance = 3)
+
+            # Precomputed Double Metaphone encodings of the psychology dictionary
+            if phonetic_index is None:
+                phonetic_index = PhoneticIndex(PhoneticIndex.encode_words(self.psy_dict))
+            self.phonetic_index = phonetic_index
+
+            self.unigram_model, self.bigram_model, self.right_bigram_model, self.trigram_model = n_gram_model.n_gram_model()
+
+        self.n_gram_store = n_gram_model.store
 
-        # Initialize N-Gram models
-        n_gram_model = NGramModel()
-        self.unigram_model, self.bigram_model, self.right_bigram_model, self.trigram_model = n_gram_model.n_gram_model()
+        # Distance engine to verify the candidates
+        self.edit_distance = EditDistance()
 
         # Set hyperparameters
         self.bi_weight = bi_weight
@@ -43,50 +101,223 @@ class SpellCheckModel:
         self.double_metaphone_weight = double_metaphone_weight
         self.context_score_weight = context_score_weight
         self.n_candidate = n_candidate
+        self.phonetic_candidates = phonetic_candidates      # Also propose words sounding alike beyond an edit distance of 3
 
         # Token Cleaner
         self.token_cleaner = TokenCleaner()
 
+        # Tokenizer giving the position of every token
+        self.span_tokenizer = SpanTokenizer()
+
+        # Errors of the sentences of the last incremental check, keyed by sentence text
+        self.sentence_cache = {}
+
+        # LRU caches of the edit-distance candidates per error token and the context score per n-gram context
+        self.cache_size = cache_size
+        self.context_cache_size = context_cache_size
+        self.candidate_cache = LRUCache(cache_size)
+        self.context_score_cache = LRUCache(context_cache_size)
+
+        # Memoised lemmas of the out-of-dictionary tokens
+        self.lemmatizer = Lemmatizer(self.dict, context_cache_size)
+
+        # Dictionary size the cached results were computed with
+        self.cached_dict_size = len(self.dict)
+
+
+    # Function to save the model to a file that other processes can memory-map
+    def save_model_file(self, file_path = os.path.join("Models", "spell_check_model.bin")):
+        ModelFile.write(file_path, self.dict, self.psy_dict, self.deletion_index, self.phonetic_index, self.n_gram_store)
+        self.model_file = file_path
+        self.model_file_dict_size = len(self.dict)
+
+
+    # Function to get the hyperparameters (to rebuild the same model in a worker)
+    def get_hyperparameters(self):
+        return {
+            "bi_weight": self.bi_weight,
+            "bi_right_weight": self.bi_right_weight,
+            "tri_weight": self.tri_weight,
+            "threshold": self.threshold,
+            "edit_distance_weight": self.edit_distance_weight,
+            "double_metaphone_weight": self.double_metaphone_weight,
+            "context_score_weight": self.context_score_weight,
+            "n_candidate": self.n_candidate,
+            "phonetic_candidates": self.phonetic_candidates,
+            "cache_size": self.cache_size,
+            "context_cache_size": self.context_cache_size
+        }
+
+
+    # Function to get a key of the model contents (dictionaries, n-gram counts and their options)
+    def get_model_key(self):
+
+        sha = hashlib.sha256()
+        sha.update(repr((self.n_gram_builder.get_cache_key(), self.n_gram_builder.quantise)).encode('UTF-8'))
+        sha.update("\n".join(self.dict).encode('UTF-8'))
+        sha.update(b"\0")
+        sha.update("\n".join(sorted(self.psy_dict)).encode('UTF-8'))
+
+        return sha.hexdigest()
+
+
+    # Function to get a model file of the current model for the batch workers
+    # (named by the model key, so it is only written once per model and reused by later runs)
+    def get_model_file(self):
+
+        if self.model_file is not None and self.model_file_dict_size == len(self.dict):
+            return self.model_file
+
+        file_path = os.path.join("Models", f"spell_check_model_{self.get_model_key()[:16]}.bin")
+
+        if os.path.exists(file_path):
+            self.model_file = file_path
+            self.model_file_dict_size = len(self.dict)
+        else:
+            self.save_model_file(file_path)
+
+        return self.model_file
+
+
+    # Detect errors in many documents, yielding (non_word_errors, real_word_errors) per document in order
+    # (workers = 1 checks in this process, None uses one process per CPU)
+    def check_iter(self, texts, workers = 1, chunk_size = 8):
+
+        workers = workers or os.cpu_count() or 1
+
+        # Run in this process when there is no parallelism to gain
+        if workers == 1:
+            for text in texts:
+                yield self.error_detection(text)
+            return
+
+        # Workers memory-map the model file instead of rebuilding the model
+        model_file = self.get_model_file()
+
+        # Spawned, not forked, as the caller may be a thread of the GUI
+        context = multiprocessing.get_context("spawn")
+
+        with context.Pool(workers, initializer = _init_worker,
+                          initargs = (model_file, self.get_hyperparameters())) as pool:
+            yield from pool.imap(_check_text, texts, chunksize = chunk_size)
+
+
+    # Detect errors in a list of documents
+    def check_many(self, texts, workers = 1, chunk_size = 8):
+        return list(self.check_iter(texts, workers, chunk_size))
+
+
+    # Function to add new corpus text (text, or the path of a text file) without rebuilding the model
+    # Only the new text is tokenised; returns the words it added to the psychology dictionary
+    # (the dictionary builder saves them, so they are still known after a restart, like the ingested text)
+    def ingest(self, dictionary_builder, text = None, path = None):
+
+        if self.read_only:
+            raise ValueError("A memory-mapped model cannot be updated. Ingest into a built model and save the model file again.")
+
+        if dictionary_builder is None:
+            raise ValueError("A DictionaryBuilder is needed to save the new words with the dictionary files.")
+
+        # Keep the cleaned text with the corpus, so a full rebuild gives the same model
+        cleaned_text = self.n_gram_builder.corpus_builder.add_ingested_text(text = text, path = path)
+
+        if cleaned_text is None:
+            return []
+
+        # Merge the n-gram counts of the new text and rebuild the probabilities from them
+        self.n_gram_store = self.n_gram_builder.ingest(cleaned_text, self.n_gram_store)
+        self.unigram_model, self.bigram_model, self.right_bigram_model, self.trigram_model = \
+            self.n_gram_builder.n_gram_model(self.n_gram_store)
+
+        # New psychology words (the dictionary builder shares the lexicon, psy_dict and phonetic index with the model)
+        words = self.token_cleaner.clean_tokens_dict(cleaned_text.split())
+        new_words = dictionary_builder.add_psy_words(words)
+
+        for word in new_words:
+            self.deletion_index.add(word)
+
+            # Structures the model was given apart from the builder's are updated as well
+            if self.psy_dict is not dictionary_builder.get_psy_dict():
+                self.psy_dict.add(word)
+            if self.dict is not dictionary_builder.get_lexicon():
+                self.dict.add(word)
+            if self.phonetic_index is not dictionary_builder.get_phonetic_index():
+                self.phonetic_index.add(word)
+
+        # The model file and every cached result are out of date
+        self.model_file = None
+        self.model_file_dict_size = None
+        self.lemmatizer.update_lexicon(self.dict)
+        self.clear_caches()
+
+        return new_words
+
 
     # Function to update the dictionary
     def update_dict(self, new_dict):
         self.dict = new_dict
+        self.lemmatizer.update_lexicon(new_dict)
+        self.clear_caches()
 
 
-    # Function to compute Damerau-Levenshtein
-    def dl_dist(self, s1, s2):
-        
-        d = {}
-        lenstr1, lenstr2 = len(s1), len(s2)
-
-        # Initialize the distance matrix
-        for i in range(-1, lenstr1 + 1):
-            d[(i, -1)] = i + 1
-        for j in range(-1, lenstr2 + 1):
-            d[(-1, j)] = j + 1
-
-        # Compute distances
-        for i in range(lenstr1):
-            for j in range(lenstr2):
-                cost = 0 if s1[i] == s2[j] else 1
-                d[(i, j)] = min(
-                    d[(i - 1, j)] + 1,  # Deletion
-                    d[(i, j - 1)] + 1,  # Insertion
-                    d[(i - 1, j - 1)] + cost  # Substitution
-                )
-                if i and j and s1[i] == s2[j - 1] and s1[i - 1] == s2[j]:
-                    d[(i, j)] = min(d[(i, j)], d[(i - 2, j - 2)] + cost)  # Transposition
-
-        return d[lenstr1 - 1, lenstr2 - 1]
+    # Function to drop every cached result
+    def clear_caches(self):
+        self.sentence_cache = {}
+        self.candidate_cache.clear()
+        self.context_score_cache.clear()
+        self.lemmatizer.known_cache.clear()
+        self.cached_dict_size = len(self.dict)
+
+
+    # Function to drop the cached results when words have been added to the dictionary
+    def check_caches(self):
+        if self.cached_dict_size != len(self.dict):
+            self.clear_caches()
+
+
+    # Function to get the hit / miss / eviction counters of the caches
+    def get_cache_stats(self):
+        return {
+            "candidates": self.candidate_cache.stats(),
+            "context_scores": self.context_score_cache.stats(),
+            **self.lemmatizer.stats()
+        }
+
+
+    # Weighted log-probability of a token in its left bigram, right bigram and trigram context
+    def get_context_score(self, bigram, bigram_right, trigram):
+
+        # (w-2, w-1, w, w+1) identifies all three n-grams
+        key = (trigram[0], trigram[1], trigram[2], bigram_right[1])
+        weighted_prob = self.context_score_cache.get(key)
+
+        if weighted_prob is None:
+
+            bigram_prob = self.bigram_model(bigram)[1]
+            bigram_right_prob = self.right_bigram_model(bigram_right)[1]
+            trigram_prob = self.trigram_model(trigram)[1]
+
+            weighted_prob = self.bi_weight * bigram_prob + \
+                            self.bi_right_weight * bigram_right_prob + \
+                            self.tri_weight * trigram_prob
+
+            self.context_score_cache.put(key, weighted_prob)
+
+        return weighted_prob
+
+
+    # Function to compute Damerau-Levenshtein (optimal string alignment) distance
+    def dl_dist(self, s1, s2, max_distance = None):
+        return self.edit_distance.distance(s1, s2, max_distance)
     
     
     # Compute double metaphone distance for candidates
     def get_double_metaphone_dist(self, error_token, candidates):
 
-        error_token_encoding = doublemetaphone(error_token)
+        error_token_encoding = self.phonetic_index.get_codes(error_token)
 
         for candidate in candidates:
-            token_encoding = doublemetaphone(candidate["token"])
+            token_encoding = self.phonetic_index.get_codes(candidate["token"])
 
             candidate["double_metaphone_distance"] = sum(
                 1 if token_encoding[i] != error_token_encoding[i] else 0
@@ -98,12 +329,32 @@ class SpellCheckModel:
     # Formulate correction candidates
     def formulate_candidate(self, error_token, error_bigram, error_bigram_right, error_trigram):
 
-        candidates = []
+        self.check_caches()
+
+        # Words within an edit distance of 3 (cached per error token)
+        edit_candidates = self.candidate_cache.get(error_token)
+
+        if edit_candidates is None:
+
+            # Only verify the words sharing a delete variant with the error token
+            tokens = self.deletion_index.lookup(error_token)
+            edit_dists = self.edit_distance.distance_many(error_token, tokens, max_distance = 3)
 
-        for token in self.psy_dict:
-            edit_dist = self.dl_dist(error_token, token)
-            if edit_dist <= 3:  # Limit to an edit distance of 3
-                candidates.append({"token": token, "edit_dist": edit_dist})
+            edit_candidates = tuple(
+                (token, edit_dist) for token, edit_dist in zip(tokens, edit_dists)
+                if edit_dist <= 3   # Limit to an edit distance of 3
+            )
+
+            # Words sharing a Double Metaphone encoding that are further away in spelling
+            # (index hits rejected above as more than 3 edits away are kept here)
+            if self.phonetic_candidates:
+                edit_tokens = set(token for token, _ in edit_candidates)
+                phonetic_tokens = [token for token in self.phonetic_index.lookup(error_token) if token not in edit_tokens]
+                edit_candidates += tuple(zip(phonetic_tokens, self.edit_distance.distance_many(error_token, phonetic_tokens)))
+
+            self.candidate_cache.put(error_token, edit_candidates)
+
+        candidates = [{"token": token, "edit_dist": edit_dist} for token, edit_dist in edit_candidates]
 
         filtered_candidates = []
 
@@ -114,13 +365,7 @@ class SpellCheckModel:
             bigram_right = (token, error_bigram_right[1])
             trigram = (error_trigram[0], error_trigram[1], token)
 
-            bigram_prob = self.bigram_model(bigram)[1]
-            bigram_right_prob = self.right_bigram_model(bigram_right)[1]
-            trigram_prob = self.trigram_model(trigram)[1]
-
-            weighted_prob = self.bi_weight * bigram_prob + \
-                            self.bi_right_weight * bigram_right_prob + \
-                            self.tri_weight * trigram_prob
+            weighted_prob = self.get_context_score(bigram, bigram_right, trigram)
 
             if weighted_prob >= self.threshold:
                 candidate["context_score"] = weighted_prob
@@ -143,107 +388,133 @@ class SpellCheckModel:
         return [candidate["token"] for candidate in final_candidates[:self.n_candidate]]
 
 
-    # Detect spelling errors in the text
-    def error_detection(self, text):
+    # Analyse one sentence, returning its errors in token order with positions relative to the sentence
+    def analyse_sentence(self, sentence):
+
+        errors = []
+
+        # Tokenization (tokens come with their positions in the sentence)
+        token_spans = self.span_tokenizer.word_spans(sentence)
+
+        # Clean tokens
+        cleaned_tokens_with_positions = self.token_cleaner.clean_input_tokens(token_spans)
+
+        # Padding for bigram and trigram context
+        cleaned_tokens = [token for (token, start, end) in cleaned_tokens_with_positions]
+        cleaned_tokens_pad_2 = list(nltk.pad_sequence(cleaned_tokens, 2, pad_left=True, pad_right=True, left_pad_symbol='<s>', right_pad_symbol='</s>'))
+        cleaned_tokens_pad_3 = list(nltk.pad_sequence(cleaned_tokens, 3, pad_left=True, pad_right=True, left_pad_symbol='<s>', right_pad_symbol='</s>'))
+
+        # Create n-grams
+        bigrams = list(nltk.bigrams(cleaned_tokens_pad_2))
+        trigrams = list(nltk.trigrams(cleaned_tokens_pad_3))
+
+        # Out-of-dictionary tokens whose lemma is not in the dictionary either (lemmatised in one batch)
+        unknown_tokens = self.lemmatizer.get_unknown([
+            token for token in cleaned_tokens
+            if token not in self.dict and token != "<numeric_token>"
+        ])
+
+        # Detect errors for each token
+        for i in range(len(cleaned_tokens)):
+
+            # get the token and position
+            token = cleaned_tokens[i]
+            start_pos = cleaned_tokens_with_positions[i][1]
+            end_pos = cleaned_tokens_with_positions[i][2]
+
+            # get the n-grams
+            bigram = bigrams[i]
+            bigram_next = bigrams[i + 1]
+            trigram = trigrams[i]
+
+            # check for non-word error: word and lemma not in dictionary and its not a number
+            if token in unknown_tokens:
+
+                # non word error detected
+                candidates = self.formulate_candidate(token, bigram, bigram_next, trigram)
+                errors.append(("NON_WORD", token, (start_pos, end_pos), candidates))
+                continue
+
+            # Check for real-word errors based on n-gram probabilities (weighted score)
+            weighted_prob = self.get_context_score(bigram, bigram_next, trigram)
+
+            # if weighted probability is less than threshold
+            if weighted_prob < self.threshold:
+                # real word error detected
+                candidates = self.formulate_candidate(token, bigram, bigram_next, trigram)
+                errors.append(("REAL_WORD", token, (start_pos, end_pos), candidates))
+
+        return errors
+
+
+    # Detect spelling errors sentence by sentence, yielding (sentences done, sentence count, errors of the sentence)
+    # Each error is an (error type, error) pair; closing the generator early stops the analysis
+    def iter_error_detection(self, text, use_cache = False):
 
-        sentences = nltk.sent_tokenize(text)
-        offset = 0
-        non_word_errors = []
-        real_word_errors = []
         id = 0
 
-        # Process each sentence
-        for sentence in sentences:
-            tokens_with_positions = []
-            tokens = nltk.word_tokenize(sentence)
-
-            # Tokenization
-            for token in tokens:    # Create token records with the position information
-                start_pos = text.find(token, offset)
-                end_pos = start_pos + len(token)
-                tokens_with_positions.append((token, (start_pos, end_pos)))
-                offset = end_pos
-
-            # Clean tokens
-            cleaned_tokens_with_positions = self.token_cleaner.clean_input_tokens(tokens_with_positions)
-
-            # Padding for bigram and trigram context
-            cleaned_tokens = [token for (token, indexes) in cleaned_tokens_with_positions]
-            cleaned_tokens_pad_2 = list(nltk.pad_sequence(cleaned_tokens, 2, pad_left=True, pad_right=True, left_pad_symbol='<s>', right_pad_symbol='</s>'))
-            cleaned_tokens_pad_3 = list(nltk.pad_sequence(cleaned_tokens, 3, pad_left=True, pad_right=True, left_pad_symbol='<s>', right_pad_symbol='</s>'))
-
-            # Create n-grams
-            bigrams = list(nltk.bigrams(cleaned_tokens_pad_2))
-            trigrams = list(nltk.trigrams(cleaned_tokens_pad_3))
-
-            # Detect errors for each token
-            for i in range(len(cleaned_tokens)):
-
-                # get the token and position
-                token = cleaned_tokens[i]
-                start_pos = cleaned_tokens_with_positions[i][1][0]
-                end_pos = cleaned_tokens_with_positions[i][1][1]
-
-                # get the n-grams
-                bigram = bigrams[i]
-                bigram_next = bigrams[i + 1]
-                trigram = trigrams[i]
-
-                # check for non-word error with dictionary and != <numeric_token>:
-                if token not in self.dict and token != "<numeric_token>":
-
-                    # check for lemma
-                    w = Word(token)
-                    lemma = w.lemmatize()
-
-                    if lemma not in self.dict:  # if word, lemma not in dictionary and its not a number
-
-                        # non word error detected
-                        candidates = self.formulate_candidate(token, bigram, bigram_next, trigram)
-                        error = {
-                            "id": "NON_WORD_" + str(id),
-                            "error_token": token,
-                            "position": (start_pos, end_pos),
-                            "candidates": candidates
-                        }
-                        id += 1
-                        non_word_errors.append(error)
-                        continue
-
-                # Check for real-word errors based on n-gram probabilities
-                bigram_prob = self.bigram_model(bigram)[1]
-                bigram_next_prob = self.right_bigram_model(bigram_next)[1]
-                trigram_prob = self.trigram_model(trigram)[1]
-
-                # weighted score
-                weighted_prob = self.bi_weight * bigram_prob + self.bi_right_weight * bigram_next_prob + self.tri_weight * trigram_prob
-
-                # if weighted probability is less than threshold
-                if weighted_prob < self.threshold:
-                    # real word error detected
-                    candidates = self.formulate_candidate(token, bigram, bigram_next, trigram)
-
-                    # print("\n")
-                    # print("Token: ", token)
-                    # print("Bigram:", str(bigram))
-                    # print("Bigram Right: ", str(bigram_next))
-                    # print("Trigram: ", str(trigram))
-
-                    # # print all scores for debugging
-                    # print("Bigram Score: ", str(bigram_prob))
-                    # print("Bigram Right Score: ", str(bigram_next_prob))
-                    # print("Trigram Score: ", str(trigram_prob))
-                    # print("Weighted Score: ", str(weighted_prob))
-                    # print("\n")
+        # Results depend on the dictionary, so a changed dictionary invalidates the caches
+        self.check_caches()
+
+        # Sentences analysed for this text (only these are kept for the next check)
+        sentence_cache = {}
+        completed = False
+
+        sentence_spans = self.span_tokenizer.sentence_spans(text)
 
+        try:
+
+            # Process each sentence
+            for sentence_index, (sentence_start, sentence_end) in enumerate(sentence_spans):
+
+                sentence = text[sentence_start:sentence_end]
+
+                if use_cache:
+                    # n-gram context is padded per sentence, so the sentence text alone decides its errors
+                    sentence_errors = self.sentence_cache.get(sentence)
+                    if sentence_errors is None:
+                        sentence_errors = self.analyse_sentence(sentence)
+                    sentence_cache[sentence] = sentence_errors
+                else:
+                    sentence_errors = self.analyse_sentence(sentence)
+
+                # Shift the positions into the text and number the errors in reading order
+                errors = []
+
+                for error_type, token, (start_pos, end_pos), candidates in sentence_errors:
                     error = {
-                        "id": "REAL_WORD_" + str(id),
+                        "id": error_type + "_" + str(id),
                         "error_token": token,
-                        "position": (start_pos, end_pos),
-                        "candidates": candidates
+                        "position": (sentence_start + start_pos, sentence_start + end_pos),
+                        "candidates": list(candidates)
                     }
-
                     id += 1
+                    errors.append((error_type, error))
+
+                yield sentence_index + 1, len(sentence_spans), errors
+
+            completed = True
+
+        finally:
+            if use_cache:
+                # A stopped check keeps the previous sentences too, so the next check can reuse both
+                if completed:
+                    self.sentence_cache = sentence_cache
+                else:
+                    self.sentence_cache.update(sentence_cache)
+
+
+    # Detect spelling errors in the text
+    def error_detection(self, text, use_cache = False):
+
+        non_word_errors = []
+        real_word_errors = []
+
+        for sentences_done, sentence_count, errors in self.iter_error_detection(text, use_cache):
+            for error_type, error in errors:
+                if error_type == "NON_WORD":
+                    non_word_errors.append(error)
+                else:
                     real_word_errors.append(error)
 
-        return non_word_errors, real_word_errors
\ No newline at end of file
+        return non_word_errors, real_word_errors
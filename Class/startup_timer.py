@@ -0,0 +1,51 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module to Time the Startup Stages (imports, dictionary, model) of the Application
+"""
+
+import contextlib
+import threading
+import time
+
+
+class StartupTimer:
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.stages = []        # (stage name, seconds) in the order they finished
+        self.lock = threading.Lock()
+
+
+    # Context manager to time one stage
+    @contextlib.contextmanager
+    def stage(self, name):
+
+        stage_start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.stages.append((name, time.perf_counter() - stage_start))
+
+
+    # Function to get the seconds since the timer was created
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+
+    # Function to format the breakdown, one stage per line
+    def report(self):
+
+        with self.lock:
+            stages = list(self.stages)
+
+        width = max([len(name) for name, seconds in stages] + [len("total")])
+        lines = [f"{name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in stages]
+        lines.append(f"{'total':<{width}}  {self.elapsed() * 1000:8.1f} ms")
+
+        return "\n".join(lines)
@@ -0,0 +1,74 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Module to Stream Text Through the Spell Check Model (headless checking of large inputs)
+"""
+
+
+class StreamChecker:
+
+    def __init__(self, model, read_size = 65536, max_buffer_size = 1048576):
+        self.model = model
+        self.read_size = read_size                  # Characters read from the input at a time
+        self.max_buffer_size = max_buffer_size      # A single sentence longer than this is checked as it is
+
+
+    # Function to split complete sentences off the buffer (returns the length of the complete part)
+    def get_complete_length(self, buffer):
+
+        sentence_spans = self.model.span_tokenizer.sentence_spans(buffer)
+
+        # The last sentence may continue in the next read, so keep it in the buffer
+        if len(sentence_spans) < 2:
+            return 0
+
+        return sentence_spans[-1][0]
+
+
+    # Function to check a text stream, yielding errors with absolute character offsets
+    def check_stream(self, stream):
+
+        buffer = ""
+        offset = 0      # Absolute position of the buffer in the stream
+        error_id = 0
+
+        while True:
+
+            chunk = stream.read(self.read_size)
+            end_of_stream = not chunk
+            buffer += chunk
+
+            if end_of_stream:
+                length = len(buffer)
+            else:
+                length = self.get_complete_length(buffer)
+                if length <= 0 and len(buffer) >= self.max_buffer_size:
+                    length = len(buffer)
+
+            if length > 0:
+
+                non_word_errors, real_word_errors = self.model.error_detection(buffer[:length])
+
+                # Report in reading order with ids that are unique over the whole stream
+                errors = [("non_word", err) for err in non_word_errors] + [("real_word", err) for err in real_word_errors]
+
+                for error_type, err in sorted(errors, key = lambda item: item[1]["position"]):
+                    start, end = err["position"]
+                    yield {
+                        "id": error_id,
+                        "type": error_type,
+                        "error_token": err["error_token"],
+                        "start": offset + start,
+                        "end": offset + end,
+                        "candidates": err["candidates"]
+                    }
+                    error_id += 1
+
+                buffer = buffer[length:]
+                offset += length
+
+            if end_of_stream:
+                return
@@ -2,7 +2,7 @@
 NAME: CHEAH WENG HOE
 TP NUMBER: TP055533
 Date Created: 24/12/2024
-Date Modified: 30/12/2024
+Date Modified: 18/10/2026
 
 Module to Clean the Tokens from the Corpus
 """
@@ -12,80 +12,139 @@ import string
 
 class TokenCleaner:
 
+    # Cleaning patterns (also part of the cache key of the compiled n-gram model)
+    HTTP_URL_PATTERN = r'http[s]?://\S+'
+    WWW_URL_PATTERN = r'www\.\S+'
+    SPECIAL_CHARACTER_PATTERN = r'[^\w\s]'
+    UNDERSCORE_PATTERN = r'^_+|_+$'
+    NUMERIC_PATTERN = r'\d'
+
+    # Compiled once for every token
+    HTTP_URL_REGEX = re.compile(HTTP_URL_PATTERN)
+    WWW_URL_REGEX = re.compile(WWW_URL_PATTERN)
+    SPECIAL_CHARACTER_REGEX = re.compile(SPECIAL_CHARACTER_PATTERN)
+    UNDERSCORE_REGEX = re.compile(UNDERSCORE_PATTERN)
+    NUMERIC_REGEX = re.compile(NUMERIC_PATTERN)
+
+    # Common punctuations expanded with custom ones
+    PUNCTUATIONS = frozenset(string.punctuation) | {'....', '--', '-', '“', '”', '’', '‘', '€', '”', '…', '–', '—'}
+
+    # Cleaned tokens remembered per mode (corpus tokens repeat a lot)
+    CLEAN_CACHE_SIZE = 65536
+
+    def __init__(self):
+        self.dict_cache = {}        # Token -> cleaned token ('' if dropped)
+        self.n_gram_cache = {}
+
     # Function to get punctuations
     def get_punctuations(self):
-        # Include common punctuations and expand with custom ones
-        punct = set(string.punctuation)
-        punct.update({'....', '--', '-', '“', '”', '’', '‘', '€', '”', '…', '–', '—'})
-        return punct
+        return set(self.PUNCTUATIONS)
 
     # Function to remove leading and trailing underscores
     def remove_leading_underscore(self, token):
-        return re.sub(r'^_+|_+$', '', token)
+        return self.UNDERSCORE_REGEX.sub('', token)
 
     # Function to remove numeric characters from a token
     def remove_numeric_characters(self, token):
-        return re.sub(r'\d', '', token)
+        return self.NUMERIC_REGEX.sub('', token)
 
-    # Function to clean tokens for dictionary
-    def clean_tokens_dict(self, tokens):
-        punctuations = self.get_punctuations()
-        cleaned_tokens = []
-        
-        for token in tokens:
-            # Remove URLs
-            token = re.sub(r'http[s]?://\S+', '', token)  # Remove HTTPS URLs
-            token = re.sub(r'www\.\S+', '', token)        # Remove WWW URLs
-            
-            # Remove special characters that don't form meaningful words
-            token = re.sub(r'[^\w\s]', '', token)  # Remove all non-alphanumeric characters except spaces
-            
-            # Remove numeric characters and other unwanted patterns
+    # Function to remove URLs (the patterns cannot match without these substrings)
+    def remove_urls(self, token):
+        if 'http' in token:
+            token = self.HTTP_URL_REGEX.sub('', token)
+        if 'www.' in token:
+            token = self.WWW_URL_REGEX.sub('', token)
+        return token
+
+    # Function to clean one token for dictionary ('' if it is dropped)
+    def clean_token_dict(self, token):
+
+        # Alphabetic tokens have no URL, special character, underscore or digit to remove
+        if token.isalpha():
+            token = token.lower()
+
+        else:
+            token = self.remove_urls(token)
+            token = self.SPECIAL_CHARACTER_REGEX.sub('', token)  # Remove all non-alphanumeric characters except spaces
             token = self.remove_leading_underscore(token)  # Clean leading/trailing underscores
-            token = self.remove_numeric_characters(token) if self.contains_number(token) else token
+            token = self.remove_numeric_characters(token)  # Remove numeric characters
             token = token.strip('-').lower()  # Remove leading dashes and convert to lowercase
-            
-            # Ensure token is not empty and not in punctuations
-            if token and token not in punctuations:
-                cleaned_tokens.append(token)
 
-        return cleaned_tokens
+        # Ensure token is not empty and not in punctuations
+        return token if token not in self.PUNCTUATIONS else ''
 
-    # Function to clean tokens for n-gram model
-    def clean_tokens_n_gram(self, tokens):
-        punctuations = self.get_punctuations()
-        cleaned_tokens = []
-        
-        for token in tokens:
-            # Remove URLs
-            token = re.sub(r'http[s]?://\S+', '', token)
-            token = re.sub(r'www\.\S+', '', token)
-            
-            # Remove special characters that don't form meaningful words
-            token = re.sub(r'[^\w\s]', '', token)  # Remove all non-alphanumeric characters except spaces
-            
-            # Additional cleaning steps
+    # Function to clean one token for n-gram model ('' if it is dropped)
+    def clean_token_n_gram(self, token):
+
+        # Alphabetic tokens have no URL, special character, underscore, dash or quote to remove
+        if token.isalpha():
+            token = token.lower()
+
+        else:
+            token = self.remove_urls(token)
+            token = self.SPECIAL_CHARACTER_REGEX.sub('', token)  # Remove all non-alphanumeric characters except spaces
             token = self.remove_leading_underscore(token)
             token = token.strip('-')  # Remove leading dashes
             token = token.strip('\'') if token != "'s" else token  # Keep possessive "'s"
             token = token.lower()  # Convert to lowercase
-            
-            # Ensure token is not empty and not in punctuations
-            if token and token not in punctuations:
-                cleaned_tokens.append(token)
 
-        return cleaned_tokens
+        # Ensure token is not empty and not in punctuations
+        return token if token not in self.PUNCTUATIONS else ''
+
+    # Generator cleaning a token stream with a per-token cache
+    def iter_clean_tokens(self, tokens, clean_token, cache):
+
+        for token in tokens:
+
+            cleaned_token = cache.get(token)
+
+            if cleaned_token is None:
+                cleaned_token = clean_token(token)
+                if len(cache) >= self.CLEAN_CACHE_SIZE:
+                    cache.clear()
+                cache[token] = cleaned_token
+
+            if cleaned_token:
+                yield cleaned_token
+
+    # Generator cleaning a token stream for dictionary
+    def iter_clean_tokens_dict(self, tokens):
+        return self.iter_clean_tokens(tokens, self.clean_token_dict, self.dict_cache)
+
+    # Generator cleaning a token stream for n-gram model
+    def iter_clean_tokens_n_gram(self, tokens):
+        return self.iter_clean_tokens(tokens, self.clean_token_n_gram, self.n_gram_cache)
+
+    # Generator cleaning a stream of tokenised sentences for n-gram model (one list per sentence)
+    def iter_clean_sentences_n_gram(self, sentences_tokens):
+        for tokens in sentences_tokens:
+            yield list(self.iter_clean_tokens_n_gram(tokens))
+
+    # Function to clean tokens for dictionary
+    def clean_tokens_dict(self, tokens):
+        return list(self.iter_clean_tokens_dict(tokens))
+
+    # Function to clean tokens for n-gram model
+    def clean_tokens_n_gram(self, tokens):
+        return list(self.iter_clean_tokens_n_gram(tokens))
     
-    # Function to clean input tokens
-    def clean_input_tokens(self, tokens_map):
+    # Function to clean input token spans, (token, start, end) -> lowercased (token, start, end)
+    def clean_input_tokens(self, token_spans):
         
-        punctuations = self.get_punctuations()
-        cleaned_tokens_map = [(token, indexes) for (token, indexes) in tokens_map if token not in punctuations]
-        cleaned_tokens_map = [(token.lower(), indexes) for (token, indexes) in cleaned_tokens_map]
-        cleaned_tokens_map = [(token, indexes) for (token, indexes) in cleaned_tokens_map if token != '']
+        cleaned_token_spans = [
+            (token.lower(), start, end) for (token, start, end) in token_spans
+            if token not in self.PUNCTUATIONS and token != ''
+        ]
         
-        return cleaned_tokens_map
+        return cleaned_token_spans
+
+    # Function to get the cleaning settings (used to detect when cached models are stale)
+    def get_settings(self):
+        return (
+            self.HTTP_URL_PATTERN, self.WWW_URL_PATTERN, self.SPECIAL_CHARACTER_PATTERN,
+            self.UNDERSCORE_PATTERN, self.NUMERIC_PATTERN, tuple(sorted(self.get_punctuations()))
+        )
 
     # Helper functions
     def contains_number(self, token):
-        return bool(re.search(r'\d', token))
+        return bool(self.NUMERIC_REGEX.search(token))
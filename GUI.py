@@ -2,26 +2,151 @@
 NAME: CHEAH WENG HOE
 TP NUMBER: TP055533
 Date Created: 24/12/2024
-Date Modified: 30/12/2024
+Date Modified: 18/10/2026
 
 Module to Create the GUI of Spell Checking System
 """
 
+import bisect
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
+import tkinter.font as tkfont
 import tkinter.scrolledtext as scrolledtext
 
-from Class.dictionary_builder import DictionaryBuilder
-from Class.spell_check_model import SpellCheckModel
-from Class.tokens_cleaning import TokenCleaner
+from Class.startup_timer import StartupTimer
+
+# The dictionary and model modules (nltk, textblob, metaphone) are imported by the loading thread
+
+class VirtualListbox(tk.Frame):
+
+    # Listbox over a [start, end) range of a sorted sequence that only holds the visible rows
+    def __init__(self, parent, **listbox_options):
+
+        super().__init__(parent, bg = listbox_options.get("bg"))
+
+        self.items = ()         # Sequence with len() and slicing (e.g. the Lexicon)
+        self.start = 0          # Range of the items shown
+        self.end = 0
+        self.top = 0            # Offset of the first visible row in the range
+        self.rows = 1           # Number of visible rows
+        self.selected = None    # Index of the selected item
+
+        self.listbox = tk.Listbox(self, exportselection = False, **listbox_options)
+        self.scrollbar = tk.Scrollbar(self, orient = tk.VERTICAL, command = self.yview)
+        self.scrollbar.pack(side = "right", fill = "y")
+        self.listbox.pack(side = "left", expand = True, fill = "both")
+
+        # Height of a row, to know how many rows fit
+        font = tkfont.Font(font = self.listbox.cget("font"))
+        self.row_height = font.metrics("linespace") + 1 + 2 * int(self.listbox.cget("selectborderwidth"))
+
+        self.listbox.bind("<Configure>", self.on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))
+
+
+    # Function to show every item of a sequence
+    def set_items(self, items):
+        self.items = items
+        self.set_range(0, len(items))
+
+
+    # Function to show the items in [start, end) only
+    def set_range(self, start, end):
+        self.start, self.end = start, end
+        self.top = 0
+        self.render()
+
+
+    # Function to redraw after the items changed (e.g. a word was added)
+    def refresh(self):
+        self.render()
+
+
+    # Function to select an item, scrolling it into the middle of the view
+    def select(self, index):
+
+        if not self.start <= index < self.end:
+            self.set_range(0, len(self.items))
+
+        self.selected = index
+        self.top = index - self.start - self.rows // 2
+        self.render()
+
+
+    # Fill the listbox with the visible rows
+    def render(self):
+
+        count = self.end - self.start
+        self.top = max(0, min(self.top, count - self.rows))
+
+        first = self.start + self.top
+        last = min(first + self.rows, self.end)
+
+        self.listbox.delete(0, tk.END)
+        if first < last:
+            self.listbox.insert(tk.END, *self.items[first:last])
+
+        if self.selected is not None and first <= self.selected < last:
+            self.listbox.selection_set(self.selected - first)
+
+        if count > 0:
+            self.scrollbar.set(self.top / count, min(1, (self.top + self.rows) / count))
+        else:
+            self.scrollbar.set(0, 1)
+
+
+    # Scrollbar command ("moveto", fraction) or ("scroll", n, "units" / "pages")
+    def yview(self, *args):
+
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * (self.end - self.start))
+            self.render()
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]) * (self.rows if args[2] == "pages" else 1))
+
+
+    # Function to scroll by a number of rows
+    def scroll(self, rows):
+        self.top += rows
+        self.render()
+
+
+    def on_mouse_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+
+    def on_resize(self, event):
+
+        border = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+        rows = max(1, (event.height - border) // self.row_height)
+
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+
+    def on_select(self, event):
+
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.start + self.top + selection[0]
+
 
 class SpellCheckerGUI(tk.Tk):
     
-    def __init__(self):
+    def __init__(self, startup_timer = None):
 
         # Initialise Tkinter
         super().__init__()
         print("Starting...")
+
+        # Startup breakdown (the caller may have timed the imports already)
+        self.startup_timer = startup_timer or StartupTimer()
         
         # Title of the GUI
         self.title("Spelling Correction System for Psychology")
@@ -31,24 +156,108 @@ class SpellCheckerGUI(tk.Tk):
         self.configure(bg="#f5f5f5")
 
 
-        # Build and Obtain the dictionary
-        self.dictionary_builder = DictionaryBuilder()
-        self.dict = self.dictionary_builder.get_sorted_dict()
-        self.psy_dict = self.dictionary_builder.get_psy_dict()
+        # Dictionary and model are built by the loading thread
+        self.dictionary_builder = None
+        self.dict = None
+        self.psy_dict = None
+        self.error_detection_model = None
+        self.load_error = None
+        self.non_word_errors = []
+        self.real_word_errors = []
 
+        # Spell check running on a worker thread (results are passed back through a queue)
+        self.check_thread = None
+        self.check_cancel = threading.Event()
+        self.check_results = queue.Queue()
+        self.check_run = 0          # Results of older runs are ignored
+        self.checked_text = ""
 
-        # Build the model
-        self.error_detection_model = SpellCheckModel(
-            self.dict, self.psy_dict, bi_weight = 0.3, bi_right_weight = 0.15,
-            tri_weight = 0.55, threshold = -12
-        )
+        # Offset of the first character of every line of the checked text (to convert to Tk indices)
+        self.line_starts = [0]
+
+        # Errors sorted by start offset: (start, end, error type, error, checked text), with the starts for bisect
+        self.error_table = []
+        self.error_starts = []
+        self.selected_error = None
+
+
+        # Initialize the GUI layout (CHECK and Search stay disabled until the model is ready)
+        with self.startup_timer.stage("GUI layout"):
+            self.create_layout()
+        self.set_loading_state(True)
+
+        # Build the dictionary and the model without blocking the window
+        self.loading_thread = threading.Thread(target = self.load_model, name = "model-loader", daemon = True)
+        self.loading_thread.start()
+        self.after(100, self.wait_for_model)
+
+
+    # Build the dictionary and the model (runs on the loading thread, so no Tkinter calls here)
+    def load_model(self):
+
+        try:
 
+            with self.startup_timer.stage("import model modules"):
+                from Class.dictionary_builder import DictionaryBuilder
+                from Class.spell_check_model import SpellCheckModel
 
-        # Initialize the GUI layout
-        self.create_layout()
+            # Build and Obtain the dictionary
+            with self.startup_timer.stage("dictionary"):
+                dictionary_builder = DictionaryBuilder()
+
+            # Build the model
+            with self.startup_timer.stage("model"):
+                error_detection_model = SpellCheckModel(
+                    dictionary_builder.get_lexicon(), dictionary_builder.get_psy_dict(),
+                    bi_weight = 0.3, bi_right_weight = 0.15, tri_weight = 0.55, threshold = -12,
+                    phonetic_index = dictionary_builder.get_phonetic_index()
+                )
+
+            # Load WordNet in the background so the first CHECK does not wait for it
+            error_detection_model.lemmatizer.warm_up()
+
+            self.dictionary_builder = dictionary_builder
+            self.error_detection_model = error_detection_model
+
+        except Exception as e:
+            self.load_error = e
+
+
+    # Poll the loading thread and enable the window once the model is ready
+    def wait_for_model(self):
+
+        if self.loading_thread.is_alive():
+            self.after(100, self.wait_for_model)
+            return
+
+        if self.load_error is not None:
+            self.lbl_result.config(text = "Failed to load the model.")
+            messagebox.showerror(title = "Error", message = f"Error loading the model: {self.load_error}")
+            return
+
+        self.dict = self.dictionary_builder.get_lexicon()
+        self.psy_dict = self.dictionary_builder.get_psy_dict()
+
+        # List all the words from dictionary.txt (only the visible rows are materialised)
+        with self.startup_timer.stage("dictionary list"):
+            self.dic_list.set_items(self.dict)
+            self.filter_dictionary()
+
+        self.set_loading_state(False)
+
+        print(self.startup_timer.report())
         print("\n Ready \n")
 
 
+    # Enable or disable the actions that need the model
+    def set_loading_state(self, loading):
+
+        state = "disabled" if loading else "normal"
+        self.btn_check.config(state = state)
+        self.btn_search.config(state = state)
+        self.lbl_result.config(text = "Loading model..." if loading else "---")
+
+
     # Setup the layout for the Tkinter interface
     def create_layout(self):
         
@@ -126,17 +335,8 @@ class SpellCheckerGUI(tk.Tk):
 
         ).pack(anchor="w")
 
-        # List all the words from dictionary.txt
-        self.dic_list = tk.Listbox(parent, bg = "white", fg = "black", font = ("Helvetica", 10))
-        for word in self.dict:
-            self.dic_list.insert(tk.END, word)
-
-
-        # Adding a Scroll Bar for Dictionary
-        dic_scroll = tk.Scrollbar(self.dic_list, orient = tk.VERTICAL)
-        dic_scroll.config(command = self.dic_list.yview)
-        dic_scroll.pack(side = "right", fill = "y")
-        self.dic_list.config(yscrollcommand = dic_scroll.set)
+        # Words from dictionary.txt are listed once the dictionary is loaded (with its own scroll bar)
+        self.dic_list = VirtualListbox(parent, bg = "white", fg = "black", font = ("Helvetica", 10))
         self.dic_list.pack(expand = True, fill = "both", padx = 10)
 
         self.create_dictionary_search(parent)
@@ -146,9 +346,11 @@ class SpellCheckerGUI(tk.Tk):
         search_frame = tk.Frame(parent, bg = "#e9f2f9")
         search_frame.pack(fill = "x", pady = 10)
         self.user_search = tk.StringVar()
+        self.user_search.trace_add("write", lambda *args: self.filter_dictionary())    # Narrow the list while typing
         tk.Entry(search_frame, textvariable = self.user_search, font = ("Helvetica", 10)).pack(side = "left", expand = True, 
                                                                                                fill = "x", padx = 5)
-        ttk.Button(search_frame, text = "Search", command = self.search_dictionary).pack(side = "left", padx = 5)
+        self.btn_search = ttk.Button(search_frame, text = "Search", command = self.search_dictionary)
+        self.btn_search.pack(side = "left", padx = 5)
 
 
     # Right Panel : Input field, Original Text Field, Result & Buttons
@@ -172,15 +374,24 @@ class SpellCheckerGUI(tk.Tk):
         self.txt_input.pack(fill = "both", expand = True, pady = 5)
         self.txt_input.focus()
         
+        # Two shared tags highlight every error (the error is looked up by offset)
+        self.txt_input.tag_config("non_word_error", foreground = "red")
+        self.txt_input.tag_config("real_word_error", foreground = "blue")
+        self.txt_input.tag_raise("sel")
+
         # Enable popup for user suggestion
         self.txt_input.tag_bind("sel", '<Button-3>', self.popup)
 
+        # Editing the input cancels a check in flight
+        self.txt_input.bind("<<Modified>>", self.on_input_modified)
+
 
     # Building Action Buttons
     def create_buttons_section(self, parent):
         btn_frame = tk.Frame(parent, bg = "#f5f5f5")
         btn_frame.pack(fill = "x", pady = 5)
-        ttk.Button(btn_frame, text = "CHECK", command = self.check_spelling).pack(side = "left", padx = 10)
+        self.btn_check = ttk.Button(btn_frame, text = "CHECK", command = self.check_spelling)
+        self.btn_check.pack(side = "left", padx = 10)
         ttk.Button(btn_frame, text = "CLEAR", command = self.clear_input).pack(side = "left", padx = 10)
         ttk.Button(btn_frame, text = "REVERT", command = self.revert_text).pack(side = "left", padx = 10)
 
@@ -231,15 +442,15 @@ class SpellCheckerGUI(tk.Tk):
             
             if self.selection_ind:
 
-                # Get the start and end indices of the selection
-                start_index, end_index = self.selection_ind[0], self.selection_ind[1]
+                # Get the start index of the selection
+                start_index = self.selection_ind[0]
 
-                # Get the tag names applied to the selected text
+                # Look up the error highlighted at the start of the selection
                 tag_names = self.txt_input.tag_names(start_index)
-                if len(tag_names) > 1:  # Ensure there is a second tag
-                    self.selected_tag = tag_names[1]
+                if "non_word_error" in tag_names or "real_word_error" in tag_names:
+                    self.selected_error = self.find_error(self.get_char_offset(start_index))
                 else:
-                    self.selected_tag = None
+                    self.selected_error = None
 
                 # Return True to indicate text is selected
                 return True
@@ -247,18 +458,40 @@ class SpellCheckerGUI(tk.Tk):
                 return False
         else:
             return False
+
+
+    # Function to get the character offset of a Tk index in the input field
+    def get_char_offset(self, tk_index):
+
+        count = self.txt_input.count("1.0", tk_index, "chars")
+
+        return count[0] if count else 0     # Tk counts nothing for index 1.0
+
+
+    # Function to find the (error type, error) covering a character offset of the input (None if there is none)
+    def find_error(self, char_index):
+
+        i = bisect.bisect_right(self.error_starts, char_index) - 1
+        if i < 0:
+            return None
+
+        start, end, error_type, err, error_substring = self.error_table[i]
+        if char_index >= end:
+            return None
+
+        # Edits typed since the check can move the text away from the stored offsets
+        # (compared with the checked text, as error_token is lowercased)
+        if self.txt_input.get(f"1.0 + {start} chars", f"1.0 + {end} chars") != error_substring:
+            return None
+
+        return error_type, err
     
 
     # Get Correction Candidates
     def get_candidate_for_selection(self):
 
-        for err in self.non_word_errors:
-            if err["id"] == self.selected_tag:
-                return err["candidates"]
-        
-        for err in self.real_word_errors:
-            if err["id"] == self.selected_tag:
-                return err["candidates"]
+        if self.selected_error is not None:
+            return self.selected_error[1]["candidates"]
             
         return []
     
@@ -266,9 +499,8 @@ class SpellCheckerGUI(tk.Tk):
     # Get Error Token
     def get_non_word_error_token(self):
 
-        for err in self.non_word_errors:
-            if err["id"] == self.selected_tag:
-                return err["error_token"]
+        if self.selected_error is not None and self.selected_error[0] == "NON_WORD":
+            return self.selected_error[1]["error_token"]
             
         return None
     
@@ -280,10 +512,25 @@ class SpellCheckerGUI(tk.Tk):
             start, end = self.txt_input.tag_ranges(tk.SEL)
 
             word_to_delete = self.txt_input.get(start, end)
+            end_offset = self.get_char_offset(end)
             self.txt_input.delete(start, end)
 
             self.txt_input.insert(start, selected_word)
 
+            # Keep the offsets of the errors after the replaced word in step with the text
+            self.shift_errors(end_offset, len(selected_word) - len(word_to_delete))
+
+
+    # Function to move the errors starting at or after a character offset
+    def shift_errors(self, char_index, shift):
+
+        i = bisect.bisect_left(self.error_starts, char_index)
+
+        for j in range(i, len(self.error_table)):
+            start, end, error_type, err, error_substring = self.error_table[j]
+            self.error_table[j] = (start + shift, end + shift, error_type, err, error_substring)
+            self.error_starts[j] = start + shift
+
 
     # Pop up candidate for selection
     def popup(self, event):
@@ -347,106 +594,196 @@ class SpellCheckerGUI(tk.Tk):
             messagebox.showinfo(title="No Selection", message="Please select a word to see suggestions.")
 
 
-    # Function to convert a character index to a Tkinter text widget index.
-    def char_index_to_tk_index(self, char_index, text):
+    # Function to get the offset of the first character of every line (Tk lines end at "\n" only)
+    def get_line_starts(self, text):
 
-        # Preserve line endings to account for accurate indexing
-        lines = text.splitlines(keepends = True)
-        current_index = 0
+        line_starts = [0]
+        position = text.find("\n")
 
-        for line_num, line in enumerate(lines, start = 1):
+        while position != -1:
+            line_starts.append(position + 1)
+            position = text.find("\n", position + 1)
 
-            # Calculate the end index of the current line
-            line_length = len(line)
+        return line_starts
 
-            # If the character index falls within the current line, calculate the column
-            if current_index <= char_index < current_index + line_length:
-                column = char_index - current_index
-                return f"{line_num}.{column}"
-            current_index += line_length
 
-        # Fallback to the end of the text
-        return f"{len(lines)}.{len(lines[-1]) if lines else 0}"
+    # Function to convert a character index to a Tkinter text widget index (bisect over the line starts)
+    def char_index_to_tk_index(self, char_index, line_starts):
+
+        line = bisect.bisect_right(line_starts, char_index) - 1
+
+        return f"{line + 1}.{char_index - line_starts[line]}"
     
 
-    # Function to checks the spelling in the input text
+    # Function to checks the spelling in the input text (on a worker thread, highlighting sentence by sentence)
     def check_spelling(self):
-        
+
+        # A new check replaces the one in flight
+        self.cancel_check()
+
         self.non_word_errors = []
         self.real_word_errors = []
 
+        user_input = self.txt_input.get('1.0', 'end-1c')
+        self.checked_text = user_input
+        self.line_starts = self.get_line_starts(user_input)
+
+        # Reset highlights
+        self.error_table = []
+        self.error_starts = []
+        self.selected_error = None
+        self.txt_input.tag_remove("non_word_error", "1.0", tk.END)
+        self.txt_input.tag_remove("real_word_error", "1.0", tk.END)
+
+        # Update the original text field
         self.txt_original.configure(state = 'normal')
         self.txt_original.delete('1.0', tk.END)
+        self.txt_original.insert(tk.INSERT, user_input)
+        self.txt_original.configure(state = 'disabled')
 
-        user_input = self.txt_input.get('1.0', 'end-1c')
+        self.lbl_result.config(text = "Checking...")
 
-        # Check for errors
-        self.non_word_errors, self.real_word_errors = self.error_detection_model.error_detection(user_input)
+        self.check_run += 1
+        self.check_cancel = threading.Event()
+        self.check_thread = threading.Thread(
+            target = self.run_check,
+            args = (self.check_run, user_input, self.check_cancel, self.check_thread),
+            name = "spell-check", daemon = True
+        )
+        self.check_thread.start()
 
-        # Reset tags and add tags for errors
-        self.txt_input.tag_delete(*self.txt_input.tag_names())
+        # Edits made from now on cancel the check
+        self.txt_input.edit_modified(False)
 
+        self.after(50, self.show_check_results)
 
-        # Highlight non-word errors
-        for err in self.non_word_errors:
-            start, end = err["position"]
-            print(f"Error: {err}, Substring: {user_input[start:end]}")
+        return None
 
-            # Validate indices to ensure correct substring extraction
-            if start < 0 or end > len(user_input):
-                print(f"Invalid indices for error: {err}")
-                continue
 
-            error_substring = user_input[start:end]
+    # Run a check on the worker thread (no Tkinter calls here, results go through the queue)
+    def run_check(self, run, user_input, cancel, previous_thread):
 
-            if not error_substring.strip():
-                print(f"Empty substring for error: {err}")
+        # The model is not thread-safe, so let a cancelled check stop first
+        if previous_thread is not None:
+            previous_thread.join()
+
+        if cancel.is_set():
+            return
+
+        # Check for errors (only sentences changed since the last check are analysed again)
+        sentence_results = self.error_detection_model.iter_error_detection(user_input, use_cache = True)
+
+        try:
+            for sentences_done, sentence_count, errors in sentence_results:
+                if cancel.is_set():
+                    return
+                self.check_results.put((run, "sentence", (sentences_done, sentence_count, errors)))
+
+            self.check_results.put((run, "done", None))
+
+        except Exception as e:
+            self.check_results.put((run, "error", e))
+
+        finally:
+            sentence_results.close()
+
+
+    # Stop the check in flight (its remaining results are ignored)
+    def cancel_check(self):
+
+        if self.check_thread is not None and self.check_thread.is_alive():
+            self.check_cancel.set()
+            self.check_run += 1
+            self.lbl_result.config(text = "Check cancelled.")
+
+
+    # Cancel the check in flight when the input is edited
+    def on_input_modified(self, event = None):
+
+        if self.txt_input.edit_modified():
+            self.cancel_check()
+            self.txt_input.edit_modified(False)
+
+
+    # Highlight the results sent by the worker thread so far
+    def show_check_results(self):
+
+        while True:
+
+            try:
+                run, kind, result = self.check_results.get_nowait()
+            except queue.Empty:
+                break
+
+            if run != self.check_run:
                 continue
-            
-            # Convert to Tkinter indices
-            start_index = self.char_index_to_tk_index(start, user_input)
-            end_index = self.char_index_to_tk_index(end, user_input)
 
-            # Log for debugging
-            # print(f"Highlighting: {user_input[start:end]} from {start_index} to {end_index}")r
+            if kind == "sentence":
 
-            # Apply tag
-            tag_id = f"error_{start}_{end}"  # Ensure a unique tag ID
-            self.txt_input.tag_config(err["id"], foreground = "red")
-            self.txt_input.tag_add(err["id"], start_index, end_index)
+                sentences_done, sentence_count, errors = result
+                self.highlight_errors(errors, self.checked_text)
+
+                self.lbl_result.config(text = f"Checking... {sentences_done}/{sentence_count} sentences")
+
+            elif kind == "done":
+
+                # Update result label
+                if not self.non_word_errors and not self.real_word_errors:
+                    self.lbl_result.config(text = "No errors found.")
+                else:
+                    self.lbl_result.config(text = "Errors found.")
+                return
+
+            else:
+
+                self.lbl_result.config(text = "Check failed.")
+                messagebox.showerror(title = "Error", message = f"Error checking the text: {result}")
+                return
+
+        # Keep polling while the current run is in flight
+        if self.check_thread is not None and self.check_thread.is_alive() or not self.check_results.empty():
+            self.after(50, self.show_check_results)
+
+
+    # Highlight the errors of a sentence in the input field (one tag_add per shared tag)
+    def highlight_errors(self, errors, user_input):
+
+        ranges = {"non_word_error": [], "real_word_error": []}
+
+        for error_type, err in errors:
+
+            if error_type == "NON_WORD":
+                self.non_word_errors.append(err)
+                tag = "non_word_error"
+            else:
+                self.real_word_errors.append(err)
+                tag = "real_word_error"
 
-        for err in self.real_word_errors:
             start, end = err["position"]
 
             # Validate indices to ensure correct substring extraction
             if start < 0 or end > len(user_input):
-                print(f"Invalid indices for real-word error: {err}")
+                print(f"Invalid indices for error: {err}")
                 continue
-            
+
             error_substring = user_input[start:end]
+
             if not error_substring.strip():
-                print(f"Empty substring for real-word error: {err}")
+                print(f"Empty substring for error: {err}")
                 continue
-            
-            # Convert to Tkinter indices
-            start_index = self.char_index_to_tk_index(start, user_input)
-            end_index = self.char_index_to_tk_index(end, user_input)
 
-            # Apply tag
-            self.txt_input.tag_config(err["id"], foreground = "blue")
-            self.txt_input.tag_add(err["id"], start_index, end_index)
-
-        # Update the original text field
-        self.txt_original.insert(tk.INSERT, user_input)
-        self.txt_original.configure(state = 'disabled')
+            # Errors arrive in reading order, so the table stays sorted by offset
+            self.error_table.append((start, end, error_type, err, error_substring))
+            self.error_starts.append(start)
 
-        # Update result label
-        if not self.non_word_errors and not self.real_word_errors:
-            self.lbl_result.config(text = "No errors found.")
-        else:
-            self.lbl_result.config(text = "Errors found.")
+            # Convert to Tkinter indices
+            ranges[tag].append(self.char_index_to_tk_index(start, self.line_starts))
+            ranges[tag].append(self.char_index_to_tk_index(end, self.line_starts))
 
-        return None
+        # Apply tags
+        for tag, indices in ranges.items():
+            if indices:
+                self.txt_input.tag_add(tag, *indices)
 
 
     # Function to search for a word in the dictionary
@@ -456,21 +793,34 @@ class SpellCheckerGUI(tk.Tk):
 
         if search_term in self.dict:
 
-            index = self.dict.index(search_term)
-            self.dic_list.selection_set(index)
-            self.dic_list.see(index)
+            self.dic_list.select(self.dict.rank(search_term))
 
         else:
 
             messagebox.showinfo(title="Not Found", message=f"{search_term} not found in dictionary.")
 
 
+    # Function to narrow the dictionary list to the words starting with the search term
+    def filter_dictionary(self):
+
+        if self.dict is None:
+            return
+
+        start, end = self.dict.prefix_range(self.user_search.get())
+        self.dic_list.set_range(start, end)
+
+
     # Function to add new words to dictionary
     def add_to_dict(self, word):
         
         if word.isalpha():
 
-            self.dictionary_builder.add_word_to_dict(word)
+            # The lexicon is shared with the model, so only the list view needs updating
+            if self.dictionary_builder.add_word_to_dict(word):
+                word = word.lower()
+                self.filter_dictionary()
+                self.dic_list.select(self.dict.rank(word))
+
             messagebox.showinfo(title = "Word Added", message = f"{word} added to dictionary.")
 
         else:
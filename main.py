@@ -2,22 +2,110 @@
 NAME: CHEAH WENG HOE
 TP NUMBER: TP055533
 Date Created: 24/12/2024
-Date Modified: 30/12/2024
+Date Modified: 18/10/2026
 
 Main module to run the application
 
+Without arguments the GUI is started. Passing files (or - for stdin) checks them
+headlessly and writes the errors as JSON Lines.
 """
 
-from GUI import SpellCheckerGUI
+import argparse
+import json
+import sys
 
+from Class.startup_timer import StartupTimer
+
+
+# Parse the command-line arguments
+def parse_args():
+
+    parser = argparse.ArgumentParser(description = "Spelling Correction System for Psychology")
+    parser.add_argument("files", nargs = "*", help = "Text files to check without the GUI (- reads stdin)")
+    parser.add_argument("-o", "--output", help = "Write the JSON Lines to this file instead of stdout")
+    parser.add_argument("--model-file", help = "Memory-map a model saved with SpellCheckModel.save_model_file")
+    parser.add_argument("--timings", action = "store_true", help = "Print the startup time breakdown to stderr")
+
+    # Options of the n-gram model (used when the model is built, not with --model-file)
+    parser.add_argument("--quantise", action = "store_true", help = "Serve seen n-grams from 16-bit quantised log-probabilities")
+    parser.add_argument("--out-of-core", action = "store_true", help = "Count the corpus in bounded memory, spilling sorted counts to disk")
+    parser.add_argument("--memory-budget", type = int, default = 512, metavar = "MB",
+                        help = "Megabytes of n-gram counts held before they are spilled (with --out-of-core)")
+    parser.add_argument("--min-count", type = int, default = 1, help = "Prune the n-grams of order 2 and up seen fewer times")
+    parser.add_argument("--workers", type = int, default = 1, help = "Processes counting the corpus n-grams (0: one per CPU)")
+
+    return parser.parse_args()
+
+
+# Check files headlessly, writing one JSON object per error
+def run_cli(args, startup_timer):
+
+    with startup_timer.stage("import model modules"):
+        from Class.dictionary_builder import DictionaryBuilder
+        from Class.spell_check_model import SpellCheckModel
+        from Class.stream_checker import StreamChecker
+
+    # Same hyperparameters as the GUI
+    hyperparameters = dict(bi_weight = 0.3, bi_right_weight = 0.15, tri_weight = 0.55, threshold = -12)
+
+    if args.model_file:
+        with startup_timer.stage("model"):
+            model = SpellCheckModel(None, None, model_file = args.model_file, **hyperparameters)
+    else:
+        with startup_timer.stage("dictionary"):
+            dictionary_builder = DictionaryBuilder()
+        with startup_timer.stage("model"):
+            model = SpellCheckModel(dictionary_builder.get_lexicon(), dictionary_builder.get_psy_dict(),
+                                    phonetic_index = dictionary_builder.get_phonetic_index(),
+                                    quantise = args.quantise, out_of_core = args.out_of_core,
+                                    memory_budget = args.memory_budget * 1024 * 1024, min_count = args.min_count,
+                                    n_gram_workers = args.workers or None, **hyperparameters)
+
+    if args.timings:
+        print(startup_timer.report(), file = sys.stderr)
+
+    checker = StreamChecker(model)
+    output = open(args.output, 'w', encoding = 'UTF-8') if args.output else sys.stdout
 
-if __name__ == "__main__":
-    
     try:
+        for file_name in args.files:
+
+            stream = sys.stdin if file_name == "-" else open(file_name, 'r', encoding = 'UTF-8')
+
+            try:
+                for error in checker.check_stream(stream):
+                    error["file"] = file_name
+                    output.write(json.dumps(error) + "\n")
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+
+            output.flush()
+
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+
+    startup_timer = StartupTimer()
+    args = parse_args()
+
+    if args.files:
+
+        run_cli(args, startup_timer)
+
+    else:
+
+        try:
+
+            with startup_timer.stage("import GUI"):
+                from GUI import SpellCheckerGUI
+
+            app = SpellCheckerGUI(startup_timer)
+            app.mainloop()
 
-        app = SpellCheckerGUI()
-        app.mainloop()
-    
-    except Exception as e:
+        except Exception as e:
 
-        print(f"Error starting the application: {e}")
\ No newline at end of file
+            print(f"Error starting the application: {e}")
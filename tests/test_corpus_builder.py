@@ -0,0 +1,174 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Checks of the Corpus Builder (streamed chunks against whole-file cleaning, and the processed manifest)
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+from Class.corpus_builder import CorpusBuilder
+
+
+RAW_BOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Corpora", "raw", "INTRODUCTION TO PSYCHOLOGY.txt")
+
+# Sentences, tokens, "-- ED ." runs, whitespace runs and multi-byte characters to be cut by small chunks
+BOOK_TEXT = (
+    "Contents\nChapter 1: The Mind\nChapter 2: The Brain\n\n"
+    "Chapter 1: The Mind\n\n   The amygdala  responds\n\n to threat -- ED . and the hippo-\ncampus"
+    " -- ED. consolidates   memory.\tNaïve “quotes” — café…   \n\t Second  sentence --ED . ends here."
+    " E.g. Dr. E. Erikson -- Ed. wrote -- ED\n.Eight  stages -- -- ED . of  self-\n\n-concept.  \n\n"
+    "Chapter 2: The Brain\nNeurons fire — ½ of them —  at   once.\n\n   \n"
+    "END OF THE MIND\n Trailing text after the end marker."
+)
+
+BOOKS = [
+    {"file": "mind.txt", "start_marker": "Chapter 1: The Mind", "end_marker": "END OF THE MIND", "cache_file": "mind_cleaned.txt"},
+    {"file": "brain.txt", "start_marker": "Part I", "end_marker": "END OF THE BRAIN", "cache_file": "brain_cleaned.txt"},
+]
+
+
+def write_file(file_path, text):
+    with open(file_path, 'w', encoding = 'UTF-8') as f:
+        f.write(text)
+
+
+def write_manifest(books = BOOKS):
+    write_file(os.path.join("Corpora", "corpora.json"), json.dumps({"books": books}))
+
+
+# Two raw books and their manifest in a temporary working directory
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("Corpora", "raw"))
+
+    write_file(os.path.join("Corpora", "raw", "mind.txt"), BOOK_TEXT)
+    write_file(os.path.join("Corpora", "raw", "brain.txt"),
+               "Part I\nPart I\n  Synapses -- ED . adapt with  use.\nEND OF THE BRAIN\n")
+    write_manifest()
+
+    # Books cleaned by the (in-process) workers, in order
+    cleaned_books = []
+    write_clean_contents_file = CorpusBuilder.write_clean_contents_file
+
+    def recording_write_clean_contents_file(self, start_marker, end_marker, cache_file, file_name):
+        cleaned_books.append(cache_file)
+        return write_clean_contents_file(self, start_marker, end_marker, cache_file, file_name)
+
+    monkeypatch.setattr(CorpusBuilder, "write_clean_contents_file", recording_write_clean_contents_file)
+
+    return cleaned_books
+
+
+# The main content of a book cleaned in one piece, as without streaming
+def clean_whole_file(corpus_builder, file_path, start_marker, end_marker):
+
+    with open(file_path, 'r', encoding = 'UTF-8') as f:
+        corpus_builder.text = f.read()
+
+    return corpus_builder.text_cleaning(corpus_builder.extract_main_content(start_marker, end_marker))
+
+
+def clean_streamed(corpus_builder, file_name, start_marker, end_marker):
+
+    output = io.StringIO()
+    assert corpus_builder.stream_clean_contents(file_name, start_marker, end_marker, output) is None
+
+    return output.getvalue()
+
+
+def test_streamed_chunks_match_whole_file_cleaning(corpus):
+
+    expected_text = clean_whole_file(CorpusBuilder(), os.path.join("Corpora", "raw", "mind.txt"),
+                                     "Chapter 1: The Mind", "END OF THE MIND")
+
+    # Chunks of a few bytes cut every sentence, token, "-- ED ." run and multi-byte character
+    for chunk_size in list(range(1, 24)) + [64, 65536]:
+        corpus_builder = CorpusBuilder(chunk_size = chunk_size)
+        assert clean_streamed(corpus_builder, "mind.txt", "Chapter 1: The Mind", "END OF THE MIND") == expected_text, chunk_size
+
+
+def test_streamed_book_matches_whole_file_cleaning():
+
+    corpus_builder = CorpusBuilder(chunk_size = 4093, manifest_file = None)
+    corpus_builder.corpus_dir = os.path.dirname(RAW_BOOK)
+
+    start_marker, end_marker = "Chapter 1: What is Manipulation?", "END OF INTRODUCTION TO PSYCHOLOGY"
+    expected_text = clean_whole_file(corpus_builder, RAW_BOOK, start_marker, end_marker)
+
+    assert clean_streamed(corpus_builder, os.path.basename(RAW_BOOK), start_marker, end_marker) == expected_text
+
+
+def test_streamed_corpus_matches_the_whole_file_corpus(corpus):
+
+    expected_corpus = CorpusBuilder(streaming = False).merge_cleaned_corpora()
+
+    for cache_file in [book["cache_file"] for book in BOOKS] + ["merged_cleaned_corpus.txt"]:
+        os.remove(os.path.join("Corpora", "processed", cache_file))
+
+    assert CorpusBuilder(chunk_size = 5).merge_cleaned_corpora() == expected_corpus
+
+
+def test_unchanged_books_are_not_cleaned_again(corpus):
+
+    CorpusBuilder().merge_cleaned_corpora_file()
+    assert corpus == ["mind_cleaned.txt", "brain_cleaned.txt"]
+
+    corpus.clear()
+    CorpusBuilder().merge_cleaned_corpora_file()
+    assert corpus == []
+
+
+def test_changed_books_are_cleaned_again(corpus, monkeypatch):
+
+    merged_text = CorpusBuilder().merge_cleaned_corpora()
+
+    # Changed raw text
+    corpus.clear()
+    write_file(os.path.join("Corpora", "raw", "brain.txt"), "Part I\nPart I\n  Synapses prune.\nEND OF THE BRAIN\n")
+    assert CorpusBuilder().merge_cleaned_corpora() == merged_text.rsplit("\n", 1)[0] + "\nPart I Synapses prune."
+    assert corpus == ["brain_cleaned.txt"]
+
+    # Changed markers
+    corpus.clear()
+    write_manifest([dict(BOOKS[0], end_marker = "Trailing text"), BOOKS[1]])
+    CorpusBuilder().merge_cleaned_corpora_file()
+    assert corpus == ["mind_cleaned.txt"]
+
+    # Missing cache file
+    corpus.clear()
+    os.remove(os.path.join("Corpora", "processed", "brain_cleaned.txt"))
+    CorpusBuilder().merge_cleaned_corpora_file()
+    assert corpus == ["brain_cleaned.txt"]
+
+    # Changed cleaning settings
+    corpus.clear()
+    monkeypatch.setattr(CorpusBuilder, "CORPUS_CACHE_VERSION", CorpusBuilder.CORPUS_CACHE_VERSION + 1)
+    CorpusBuilder().merge_cleaned_corpora_file()
+    assert corpus == ["mind_cleaned.txt", "brain_cleaned.txt"]
+
+
+def test_failed_books_are_not_cached(corpus):
+
+    write_file(os.path.join("Corpora", "raw", "brain.txt"), "Part I only once\nEND OF THE BRAIN\n")
+
+    corpus_builder = CorpusBuilder()
+    assert corpus_builder.process_books(corpus_builder.get_books()) == {
+        "brain_cleaned.txt": "Second occurrence of the start marker not found."
+    }
+    assert "brain_cleaned.txt" not in corpus_builder.load_processed_manifest()
+    assert not os.path.exists(os.path.join("Corpora", "processed", "brain_cleaned.txt"))
+
+    # A failed book is tried again on the next build
+    corpus.clear()
+    CorpusBuilder().merge_cleaned_corpora_file()
+    assert corpus == ["brain_cleaned.txt"]
@@ -0,0 +1,99 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Parity Check of the Deletion Index against a Full Scan of the Psychology Dictionary
+"""
+
+import os
+import random
+
+from Class.deletion_index import DeletionIndex
+from Class.edit_distance import EditDistance
+
+
+DICTIONARY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "Dictionary", "psychology_dictionary.txt")
+
+
+def load_words():
+    with open(DICTIONARY_FILE, 'r', encoding = 'UTF-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+# Misspell a word with 1 to 4 random insertions, deletions, substitutions or transpositions
+def misspell(word, rng):
+
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+
+    for _ in range(rng.randint(1, 4)):
+
+        i = rng.randrange(len(word) + 1)
+        edit = rng.choice(["insert", "delete", "substitute", "transpose"])
+
+        if edit == "insert" or not word:
+            word = word[:i] + rng.choice(alphabet) + word[i:]
+        elif edit == "delete" and i < len(word):
+            word = word[:i] + word[i + 1:]
+        elif edit == "substitute" and i < len(word):
+            word = word[:i] + rng.choice(alphabet) + word[i + 1:]
+        elif edit == "transpose" and i + 1 < len(word):
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+    return word
+
+
+# Words within max_distance with their distances, in dictionary order (as formulate_candidate verifies them)
+def within_distance(edit_distance, token, words, max_distance):
+    return [(word, dist) for word, dist in zip(words, edit_distance.distance_many(token, words, max_distance)) if dist <= max_distance]
+
+
+def test_lookup_matches_full_scan():
+
+    words = load_words()
+    deletion_index = DeletionIndex(words, max_distance = 3)
+    edit_distance = EditDistance()
+    rng = random.Random(0)
+
+    for word in rng.sample(words, 40):
+
+        token = misspell(word, rng)
+
+        expected = within_distance(edit_distance, token, words, 3)
+        found = within_distance(edit_distance, token, deletion_index.lookup(token), 3)
+
+        # Same words and distances in the same order, so the ranked candidates are the same too
+        assert found == expected, token
+        assert sorted(found, key = lambda x: x[1]) == sorted(expected, key = lambda x: x[1]), token
+
+
+def test_added_words_are_found():
+
+    deletion_index = DeletionIndex(["memory", "emotion"], max_distance = 3)
+    deletion_index.add("metacognition")
+
+    assert deletion_index.lookup("metacogniton")[-1] == "metacognition"
+    assert "memory" in deletion_index.lookup("memroy")
+
+
+def test_cached_index_matches_a_fresh_build(tmp_path):
+
+    words = load_words()[:2000]
+    cache_file = os.path.join(tmp_path, "deletion_index.pkl")
+
+    built_index = DeletionIndex.load(set(words), max_distance = 2, cache_file = cache_file)
+    cached_index = DeletionIndex.load(set(words), max_distance = 2, cache_file = cache_file)
+
+    assert cached_index.words == built_index.words
+    assert cached_index.deletes == built_index.deletes
+    assert cached_index.deletes == DeletionIndex(built_index.words, max_distance = 2).deletes
+
+    # New words (or another distance) build the index again
+    changed_index = DeletionIndex.load(set(words) | {"metacognition"}, max_distance = 2, cache_file = cache_file)
+    assert "metacognition" in changed_index.words
+
+    other_distance_index = DeletionIndex.load(set(words), max_distance = 1, cache_file = cache_file)
+    assert other_distance_index.max_distance == 1
+    assert sorted(other_distance_index.lookup("memroy")) == sorted(DeletionIndex(words, max_distance = 1).lookup("memroy"))
@@ -0,0 +1,107 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Equivalence Check of the Bit-Parallel Edit Distance against the Original Dict-Based DP
+(run with pytest, or as python -m tests.test_edit_distance for the micro-benchmark)
+"""
+
+import os
+import random
+import timeit
+
+from Class.edit_distance import EditDistance
+
+
+DICTIONARY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "Dictionary", "psychology_dictionary.txt")
+
+
+# The dl_dist of SpellCheckModel before the bit-parallel engine (optimal string alignment)
+def reference_dl_dist(s1, s2):
+
+    d = {}
+    lenstr1, lenstr2 = len(s1), len(s2)
+
+    for i in range(-1, lenstr1 + 1):
+        d[(i, -1)] = i + 1
+    for j in range(-1, lenstr2 + 1):
+        d[(-1, j)] = j + 1
+
+    for i in range(lenstr1):
+        for j in range(lenstr2):
+            cost = 0 if s1[i] == s2[j] else 1
+            d[(i, j)] = min(
+                d[(i - 1, j)] + 1,
+                d[(i, j - 1)] + 1,
+                d[(i - 1, j - 1)] + cost
+            )
+            if i and j and s1[i] == s2[j - 1] and s1[i - 1] == s2[j]:
+                d[(i, j)] = min(d[(i, j)], d[(i - 2, j - 2)] + cost)
+
+    return d[lenstr1 - 1, lenstr2 - 1]
+
+
+# Random string pairs over a small alphabet (so matches and transpositions are frequent)
+def random_pairs(count, seed = 0):
+
+    rng = random.Random(seed)
+    alphabet = "abcde"
+
+    for _ in range(count):
+        s1 = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+        s2 = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+        yield s1, s2
+
+
+def test_distance_matches_reference():
+
+    edit_distance = EditDistance()
+
+    for s1, s2 in random_pairs(20000):
+        assert edit_distance.distance(s1, s2) == reference_dl_dist(s1, s2), (s1, s2)
+
+
+def test_max_distance_cutoff():
+
+    edit_distance = EditDistance()
+
+    # Within the limit the exact distance is returned, beyond it max_distance + 1
+    for s1, s2 in random_pairs(5000, seed = 1):
+        expected = reference_dl_dist(s1, s2)
+        for max_distance in range(5):
+            assert edit_distance.distance(s1, s2, max_distance) == min(expected, max_distance + 1), (s1, s2, max_distance)
+
+
+def test_distance_many_matches_distance():
+
+    edit_distance = EditDistance()
+    words = [s2 for _, s2 in random_pairs(500, seed = 2)]
+
+    for token in ["", "abc", "edcba", "aabbccdd"]:
+        assert edit_distance.distance_many(token, words, 3) == [edit_distance.distance(token, word, 3) for word in words]
+
+
+# Micro-benchmark: microseconds per comparison over the psychology dictionary
+def benchmark(tokens = ("pyschology", "behavor", "cognitve", "anxeity"), repeat = 3):
+
+    with open(DICTIONARY_FILE, 'r', encoding = 'UTF-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+
+    edit_distance = EditDistance()
+
+    print(f"{'token':<12} {'old dict DP':>12} {'bit-parallel':>13} {'max 3':>8}   (us per comparison, {len(words)} words)")
+
+    for token in tokens:
+
+        old = min(timeit.repeat(lambda: [reference_dl_dist(token, word) for word in words], number = 1, repeat = repeat))
+        new = min(timeit.repeat(lambda: edit_distance.distance_many(token, words), number = 1, repeat = repeat))
+        capped = min(timeit.repeat(lambda: edit_distance.distance_many(token, words, 3), number = 1, repeat = repeat))
+
+        print(f"{token:<12} {old / len(words) * 1e6:12.2f} {new / len(words) * 1e6:13.2f} {capped / len(words) * 1e6:8.2f}")
+
+
+if __name__ == "__main__":
+    benchmark()
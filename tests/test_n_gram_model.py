@@ -0,0 +1,239 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Checks of the N-Gram Model (precomputed back-off tables against the closure-based models)
+"""
+
+import collections
+import json
+import math
+import os
+import random
+
+import pytest
+
+from Class.corpus_builder import CorpusBuilder
+from Class.deletion_index import DeletionIndex
+from Class.model_file import ModelFile
+from Class.n_gram_model import NGramModel
+from Class.n_gram_store import NGramStore
+from Class.phonetic_index import PhoneticIndex
+
+
+SENTENCES = [
+    "the amygdala responds to threat",
+    "the hippocampus consolidates memory",
+    "memory consolidation happens during sleep",
+    "the amygdala and the hippocampus interact",
+    "threat responses involve the amygdala",
+    "sleep supports memory",
+]
+
+
+# Sentences of an ingested text, with new words that shift the ids of the stored ones (and widen the keys)
+INGESTED_SENTENCES = [
+    "the amygdala encodes fear conditioning",
+    "rumination and worry predict anxiety",
+    "attachment styles shape adult relationships",
+    "the hippocampus consolidates memory",
+    "cortisol rises after acute stress",
+    "zeitgeber cues entrain circadian rhythms",
+]
+
+
+def count_sentences(n_gram_model, sentences):
+
+    counters = [collections.Counter() for _ in range(n_gram_model.max_order)]
+    for sentence in sentences:
+        n_gram_model.update_counters(counters, sentence.split())
+
+    return counters
+
+
+def build_store(n_gram_model, sentences = SENTENCES):
+    return NGramStore(count_sentences(n_gram_model, sentences))
+
+
+def assert_same_counts(expected_store, store):
+
+    assert list(store.vocab) == list(expected_store.vocab)
+    assert store.id_bits == expected_store.id_bits
+    assert store.total_tokens == expected_store.total_tokens
+    assert store.unigram_vocab_size == expected_store.unigram_vocab_size
+    assert list(store.unigram_counts) == list(expected_store.unigram_counts)
+
+    for n in range(2, expected_store.max_order + 1):
+        assert list(store.keys[n]) == list(expected_store.keys[n])
+        assert list(store.counts[n]) == list(expected_store.counts[n])
+
+
+# The bigram, right bigram and trigram models as built before the precomputed tables
+def closure_models(n_gram_model, store):
+
+    unigram_model, unigram_counter = n_gram_model.build_unigram_model(store)
+    bigram_model, bigram_counter = n_gram_model.build_bigram_model(store.get_counts(2), unigram_counter, unigram_model)
+    right_bigram_model, _ = n_gram_model.build_bigram_model_right(bigram_counter, unigram_counter, unigram_model)
+    trigram_model, _ = n_gram_model.build_trigram_model(store.get_counts(3), bigram_counter, bigram_model)
+
+    return bigram_model, right_bigram_model, trigram_model
+
+
+# Every stored n-gram, and random n-grams of known, unknown and padding words
+def sample_ngrams(store, n, count = 3000):
+
+    rng = random.Random(n)
+    words = list(store.vocab) + ["unseen", "<s>", "</s>"]
+
+    ngrams = [ngram for ngram, _ in store.items(n)]
+    ngrams += [tuple(rng.choice(words) for _ in range(n)) for _ in range(count)]
+
+    # Unseen trigrams ending in a stored bigram back off to it
+    if n == 3:
+        ngrams += [(rng.choice(words),) + bigram for bigram, _ in store.items(2)]
+
+    return ngrams
+
+
+def assert_same_models(expected_models, models, store):
+
+    for n, expected_model, model in zip((2, 2, 3), expected_models, models):
+        for ngram in sample_ngrams(store, n):
+
+            expected_prob, expected_log_prob = expected_model(ngram)
+            prob, log_prob = model(ngram)
+
+            # The log-probabilities are stored exactly, the probabilities come back through exp
+            assert log_prob == expected_log_prob, ngram
+            assert math.isclose(prob, expected_prob, rel_tol = 1e-12), ngram
+
+
+def test_tables_match_closure_models():
+
+    n_gram_model = NGramModel()
+    store = build_store(n_gram_model)
+
+    expected_models = closure_models(n_gram_model, store)
+    _, bigram_model, right_bigram_model, trigram_model = n_gram_model.n_gram_model(store)
+
+    assert_same_models(expected_models, (bigram_model, right_bigram_model, trigram_model), store)
+
+
+def test_tables_are_saved_in_the_model_file(tmp_path):
+
+    n_gram_model = NGramModel()
+    store = build_store(n_gram_model)
+    n_gram_model.precompute_log_probs(store)
+
+    file_path = os.path.join(tmp_path, "model.bin")
+    ModelFile.write(file_path, ["memory"], {"memory"}, DeletionIndex({"memory"}, max_distance = 1),
+                    PhoneticIndex(PhoneticIndex.encode_words({"memory"})), store)
+
+    mapped_store = ModelFile(file_path).store
+    assert "trigram.log_prob" in mapped_store.log_probs
+
+    _, bigram_model, right_bigram_model, trigram_model = NGramModel().n_gram_model(mapped_store)
+
+    assert_same_models(closure_models(n_gram_model, store), (bigram_model, right_bigram_model, trigram_model), store)
+
+
+def test_quantised_models_drop_the_exact_tables():
+
+    n_gram_model = NGramModel(quantise = True)
+    store = build_store(n_gram_model)
+    n_gram_model.precompute_log_probs(store)
+
+    n_gram_model.n_gram_model(store)
+
+    assert "bigram" in store.log_probs
+    assert not any(name.endswith(".log_prob") for name in store.log_probs)
+
+
+def test_merged_counts_match_a_fresh_build():
+
+    n_gram_model = NGramModel()
+    store = build_store(n_gram_model)
+    merged_store = store.merge(count_sentences(n_gram_model, INGESTED_SENTENCES))
+
+    assert merged_store.id_bits > store.id_bits
+    assert_same_counts(build_store(n_gram_model, SENTENCES + INGESTED_SENTENCES), merged_store)
+
+    # Text without new words keeps the ids and only adds counts
+    merged_store = store.merge(count_sentences(n_gram_model, SENTENCES[:2]))
+    assert_same_counts(build_store(n_gram_model, SENTENCES + SENTENCES[:2]), merged_store)
+
+
+def test_merged_counts_are_pruned_like_a_fresh_build():
+
+    n_gram_model = NGramModel(min_count = 2)
+    store = NGramStore(n_gram_model.prune_counters(count_sentences(n_gram_model, SENTENCES)))
+    merged_store = store.merge(count_sentences(n_gram_model, INGESTED_SENTENCES), min_count = 2)
+
+    # N-grams pruned before the merge are only counted from the new text (see NGramModel.ingest)
+    counters = count_sentences(n_gram_model, INGESTED_SENTENCES)
+    for n in range(1, n_gram_model.max_order + 1):
+        for ngram, count in store.items(n):
+            counters[n - 1][ngram] += count
+
+    expected_store = NGramStore(n_gram_model.prune_counters(counters))
+    assert_same_counts(expected_store, merged_store)
+
+
+# Raw book the corpus tests take their sample from
+RAW_BOOK = os.path.join(os.path.dirname(__file__), "..", "Corpora", "raw", "INTRODUCTION TO PSYCHOLOGY.txt")
+START_MARKER = "Chapter 1: What is Manipulation?"
+
+
+# A corpus of one sample book in a temporary working directory, with blocks and shards small enough
+# that the sample is read, sharded and spilled in many pieces
+@pytest.fixture
+def sample_corpus(tmp_path, monkeypatch):
+
+    with open(RAW_BOOK, 'r', encoding = 'UTF-8') as f:
+        raw_text = f.read()
+
+    # The main content starts at the second start marker (the first is in the table of contents)
+    start = raw_text.index(START_MARKER, raw_text.index(START_MARKER) + 1)
+    sample_text = raw_text[:start + 200000] + "\nEND OF SAMPLE\n"
+
+    os.makedirs(os.path.join(tmp_path, "Corpora", "raw"))
+    with open(os.path.join(tmp_path, "Corpora", "raw", "sample.txt"), 'w', encoding = 'UTF-8') as f:
+        f.write(sample_text)
+
+    with open(os.path.join(tmp_path, "Corpora", "corpora.json"), 'w', encoding = 'UTF-8') as f:
+        json.dump({"books": [{"file": "sample.txt", "start_marker": START_MARKER,
+                              "end_marker": "END OF SAMPLE", "cache_file": "sample_cleaned.txt"}]}, f)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(NGramModel, "BLOCK_SIZE", 8192)
+    monkeypatch.setattr(NGramModel, "SHARD_SIZE", 4096)
+
+    try:
+        CorpusBuilder().merge_cleaned_corpora_file()
+        return NGramModel().build_store()
+    except LookupError as e:
+        pytest.skip(f"NLTK data is not installed: {e}")
+
+
+def test_sharded_workers_match_the_serial_build(sample_corpus):
+    assert_same_counts(sample_corpus, NGramModel(workers = 3).build_store())
+
+
+def test_out_of_core_build_matches_the_serial_build(sample_corpus):
+
+    store = NGramModel(out_of_core = True, memory_budget = 2 * 1024 * 1024).build_store()
+
+    # The sample spills more than once within the budget
+    assert sum(len(store.keys[n]) for n in (2, 3)) > 2 * 1024 * 1024 // NGramModel.COUNTER_ENTRY_BYTES
+    assert_same_counts(sample_corpus, store)
+
+
+def test_min_count_prunes_the_serial_build(sample_corpus):
+
+    n_gram_model = NGramModel(min_count = 2)
+    expected_counters = n_gram_model.prune_counters([collections.Counter(dict(sample_corpus.items(n))) for n in (1, 2, 3)])
+
+    assert_same_counts(NGramStore(expected_counters), n_gram_model.build_store())
+    assert_same_counts(NGramStore(expected_counters), NGramModel(min_count = 2, out_of_core = True, workers = 3).build_store())
@@ -0,0 +1,57 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Check that the Batch Workers Give the Same Errors as Checking in This Process
+(needs the NLTK data of the application; skipped when it is not installed)
+"""
+
+import pytest
+
+from Class.dictionary_builder import DictionaryBuilder
+from Class.spell_check_model import SpellCheckModel
+
+
+TEXTS = [
+    "Teh amygdala responds to threat and the hipocampus consolidates memmory.",
+    "Cognitve behavioural therapy targets maladaptive thougts.",
+    "Pyschology studies the mind. Neuroplastisity allows the brain to change.",
+    "",
+    "Classical conditioning pairs a neutral stimulus with an unconditoned stimulus.",
+] * 3
+
+
+@pytest.fixture(scope = "module")
+def model():
+
+    try:
+        dictionary_builder = DictionaryBuilder()
+        model = SpellCheckModel(dictionary_builder.get_lexicon(), dictionary_builder.get_psy_dict(),
+                                0.3, 0.15, 0.55, -12, phonetic_index = dictionary_builder.get_phonetic_index())
+
+        # The sentence tokeniser and WordNet are loaded by the first check
+        model.error_detection(TEXTS[0])
+
+        return model
+
+    except LookupError as e:
+        pytest.skip(f"NLTK data is not installed: {e}")
+
+
+def test_pooled_check_matches_serial(model):
+
+    serial = [model.error_detection(text) for text in TEXTS]
+
+    assert model.check_many(TEXTS) == serial
+    assert model.check_many(TEXTS, workers = 2, chunk_size = 2) == serial
+
+
+def test_model_file_is_reused(model):
+
+    model_file = model.get_model_file()
+
+    # A new model of the same contents finds the file written for the first one
+    model.model_file = None
+    assert model.get_model_file() == model_file
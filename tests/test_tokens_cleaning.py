@@ -0,0 +1,111 @@
+"""
+NAME: CHEAH WENG HOE
+TP NUMBER: TP055533
+Date Created: 18/10/2026
+Date Modified: 18/10/2026
+
+Regression Check of the Compiled Token Cleaner against the Original Per-Token re.sub Cleaning
+"""
+
+import os
+import re
+import string
+
+import nltk
+import pytest
+
+from Class.tokens_cleaning import TokenCleaner
+
+
+RAW_BOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Corpora", "raw", "INTRODUCTION TO PSYCHOLOGY.txt")
+
+# Tokens taking every branch of the cleaning (URLs, digits, underscores, dashes, quotes and punctuation)
+EDGE_TOKENS = [
+    "", "'s", "'S", "'", "''", "'quoted'", "‘quoted’", "“quote”", "...", "....", "--", "-", "–", "—", "…", "€",
+    "http://example.com/a", "https://example.com", "see:https://x.y", "www.example.com", "www.", "awww.b",
+    "httpx", "3rd", "1990s", "42", "２３", "²", "__init__", "_x_", "snake_case", "-dash-", "--ed", "co-operate",
+    "O'Brien", "rock'n'roll", "naïve", "CAFÉ", "Straße", "İstanbul", "ǅ", "e.g.", "U.S.", "(a)", "[1]", "#tag",
+    "a\tb", "tab\t", "x²", "Ⅻ", "١٢٣",
+]
+
+
+# The cleaning of TokenCleaner before the compiled patterns and the token cache
+def reference_punctuations():
+    punct = set(string.punctuation)
+    punct.update({'....', '--', '-', '“', '”', '’', '‘', '€', '”', '…', '–', '—'})
+    return punct
+
+
+def reference_clean_tokens_dict(tokens):
+
+    punctuations = reference_punctuations()
+    cleaned_tokens = []
+
+    for token in tokens:
+        token = re.sub(r'http[s]?://\S+', '', token)
+        token = re.sub(r'www\.\S+', '', token)
+        token = re.sub(r'[^\w\s]', '', token)
+        token = re.sub(r'^_+|_+$', '', token)
+        token = re.sub(r'\d', '', token) if re.search(r'\d', token) else token
+        token = token.strip('-').lower()
+
+        if token and token not in punctuations:
+            cleaned_tokens.append(token)
+
+    return cleaned_tokens
+
+
+def reference_clean_tokens_n_gram(tokens):
+
+    punctuations = reference_punctuations()
+    cleaned_tokens = []
+
+    for token in tokens:
+        token = re.sub(r'http[s]?://\S+', '', token)
+        token = re.sub(r'www\.\S+', '', token)
+        token = re.sub(r'[^\w\s]', '', token)
+        token = re.sub(r'^_+|_+$', '', token)
+        token = token.strip('-')
+        token = token.strip('\'') if token != "'s" else token
+        token = token.lower()
+
+        if token and token not in punctuations:
+            cleaned_tokens.append(token)
+
+    return cleaned_tokens
+
+
+def load_sample(size = 300000):
+    with open(RAW_BOOK, 'r', encoding = 'UTF-8') as f:
+        return f.read(size)
+
+
+def assert_same_cleaning(tokens):
+
+    token_cleaner = TokenCleaner()
+
+    # Twice, so the second pass is served from the token caches
+    for _ in range(2):
+        assert token_cleaner.clean_tokens_dict(tokens) == reference_clean_tokens_dict(tokens)
+        assert token_cleaner.clean_tokens_n_gram(tokens) == reference_clean_tokens_n_gram(tokens)
+
+
+def test_edge_tokens_match_the_reference():
+    assert_same_cleaning(EDGE_TOKENS)
+
+
+def test_book_tokens_match_the_reference():
+    assert_same_cleaning(load_sample().split())
+
+
+def test_tokenised_sentences_match_the_reference():
+
+    try:
+        sentences = [nltk.word_tokenize(sentence) for sentence in nltk.sent_tokenize(load_sample())]
+    except LookupError as e:
+        pytest.skip(f"NLTK data is not installed: {e}")
+
+    cleaned_sentences = list(TokenCleaner().iter_clean_sentences_n_gram(sentences))
+
+    assert cleaned_sentences == [reference_clean_tokens_n_gram(tokens) for tokens in sentences]